@@ -0,0 +1,72 @@
+# autoencoders.py
+import os
+
+from tensorflow.keras import layers, models
+
+WINDOW = 50
+
+
+# ------------------------------
+# ARCHITECTURES (input/output: (WINDOW, 1))
+# ------------------------------
+def build_lstm(window=WINDOW):
+    # original stacked 64/32/32/64 LSTM autoencoder
+    inp = layers.Input(shape=(window, 1))
+    x = layers.LSTM(64, return_sequences=True)(inp)
+    x = layers.LSTM(32)(x)
+    x = layers.RepeatVector(window)(x)
+    x = layers.LSTM(32, return_sequences=True)(x)
+    x = layers.LSTM(64, return_sequences=True)(x)
+    out = layers.TimeDistributed(layers.Dense(1))(x)
+    return models.Model(inp, out, name="lstm_autoencoder")
+
+
+def build_gru(window=WINDOW):
+    # one GRU layer each side of the bottleneck
+    inp = layers.Input(shape=(window, 1))
+    x = layers.GRU(32)(inp)
+    x = layers.RepeatVector(window)(x)
+    x = layers.GRU(32, return_sequences=True)(x)
+    out = layers.TimeDistributed(layers.Dense(1))(x)
+    return models.Model(inp, out, name="gru_autoencoder")
+
+
+def build_conv(window=WINDOW):
+    # 1D-conv autoencoder, no recurrence: one strided downsample / upsample
+    inp = layers.Input(shape=(window, 1))
+    x = layers.Conv1D(32, 7, strides=2, padding="same", activation="relu")(inp)
+    x = layers.Conv1D(16, 7, padding="same", activation="relu")(x)
+    x = layers.Conv1DTranspose(16, 7, padding="same", activation="relu")(x)
+    x = layers.Conv1DTranspose(32, 7, strides=2, padding="same", activation="relu")(x)
+    out = layers.Conv1D(1, 7, padding="same")(x)
+    return models.Model(inp, out, name="conv_autoencoder")
+
+
+def build_dense(window=WINDOW):
+    # plain MLP over the flattened window
+    inp = layers.Input(shape=(window, 1))
+    x = layers.Flatten()(inp)
+    x = layers.Dense(32, activation="relu")(x)
+    x = layers.Dense(8, activation="relu")(x)
+    x = layers.Dense(32, activation="relu")(x)
+    x = layers.Dense(window)(x)
+    out = layers.Reshape((window, 1))(x)
+    return models.Model(inp, out, name="dense_autoencoder")
+
+
+MODELS = {
+    "lstm": build_lstm,
+    "gru": build_gru,
+    "conv": build_conv,
+    "dense": build_dense,
+}
+
+
+def model_paths(name, models_dir):
+    """Return (model_path, threshold_path) for a variant."""
+    if name not in MODELS:
+        raise ValueError(f"Unknown model '{name}', choose from {sorted(MODELS)}")
+    return (
+        os.path.join(models_dir, f"{name}_autoencoder.h5"),
+        os.path.join(models_dir, f"{name}_threshold.joblib"),
+    )
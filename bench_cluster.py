@@ -0,0 +1,93 @@
+# bench_cluster.py
+# Throughput of cluster.py local mode (separate processes on localhost)
+# as the number of workers grows.
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from cluster import SINK_PORT, COORDINATOR_PORT, query_sink, run_local, stop_procs, wait_for_port
+from replay import format_line, load_source
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_sources(folder, n_sources, lines_per_source, template):
+    rows = load_source(template)
+    total = 0
+    for s in range(n_sources):
+        name = f"source_{s:03d}"
+        with open(os.path.join(folder, f"{name}.log"), "w") as f:
+            for i in range(lines_per_source):
+                ts, resp, tail = rows[i % len(rows)]
+                f.write(format_line(ts, name, i + 1, resp, tail))
+        total += lines_per_source
+    return total
+
+
+def run(n_workers, staging, folder, total, detector, port_offset, settle, timeout):
+    coord_port = COORDINATOR_PORT + port_offset
+    sink_port = SINK_PORT + port_offset
+    out = os.path.join(os.path.dirname(folder), f"report_{n_workers}.csv")
+    os.makedirs(folder)
+    procs = run_local(n_workers, folder, out, detector, coord_port, sink_port)
+    sink = ("127.0.0.1", sink_port)
+    try:
+        wait_for_port(sink)
+        time.sleep(settle)      # let every worker join and the ring settle
+
+        # drop the sources in at once (renames are atomic) and time from there
+        start = time.perf_counter()
+        for name in os.listdir(staging):
+            os.rename(os.path.join(staging, name), os.path.join(folder, name))
+        deadline = time.time() + timeout
+        lines = 0
+        while time.time() < deadline:
+            lines = query_sink(sink)["lines"]
+            if lines >= total:
+                break
+            time.sleep(0.02)
+        elapsed = time.perf_counter() - start
+        return lines, lines / elapsed
+    finally:
+        stop_procs(procs)
+        # move the sources back for the next run
+        for name in os.listdir(folder):
+            os.rename(os.path.join(folder, name), os.path.join(staging, name))
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cluster scaling benchmark")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--sources", type=int, default=64)
+    ap.add_argument("--lines", type=int, default=20000, help="lines per source")
+    ap.add_argument("--detector", choices=["lstm", "zscore"], default="zscore")
+    ap.add_argument("--template", default=os.path.join(HERE, "nemo.log"))
+    ap.add_argument("--settle", type=float, default=3.0,
+                    help="seconds to let workers join before the sources appear")
+    ap.add_argument("--timeout", type=float, default=600)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_cluster_")
+    staging = os.path.join(tmp, "staging")
+    folder = os.path.join(tmp, "logs")
+    os.makedirs(staging)
+    try:
+        total = make_sources(staging, args.sources, args.lines, args.template)
+        print(f"{args.sources} sources x {args.lines} lines = {total} lines, detector={args.detector}\n")
+        print(f"{'workers':>7} | {'lines':>9} | {'lines/s':>10} | {'speedup':>7}")
+        print("-" * 44)
+        base = None
+        for i, n in enumerate(args.workers):
+            lines, rate = run(n, staging, folder, total, args.detector, port_offset=10 + i,
+                              settle=args.settle, timeout=args.timeout)
+            base = base or rate
+            print(f"{n:7d} | {lines:9d} | {rate:10,.0f} | {rate / base:6.2f}x")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
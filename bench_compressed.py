@@ -0,0 +1,86 @@
+# bench_compressed.py
+# Read+parse throughput for plain vs compressed logs:
+#   plain       - uncompressed file
+#   streamed    - log_reader.iter_lines (background decompression thread)
+#   inline      - gzip/bz2.open(..., "rt") in the parsing thread
+#   to-disk     - old workflow: decompress to a temp file, then read it
+import argparse
+import bz2
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from log_reader import iter_lines, open_binary, zstandard
+from parser import parse_line
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def consume(lines):
+    n = 0
+    for line in lines:
+        if parse_line(line):
+            n += 1
+    return n
+
+
+def inline_lines(path):
+    with io.TextIOWrapper(open_binary(path), encoding="utf-8", errors="ignore") as f:
+        yield from f
+
+
+def to_disk_lines(path, tmpdir):
+    out = os.path.join(tmpdir, "decompressed.log")
+    with open_binary(path) as src, open(out, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    with open(out, "r", encoding="utf-8", errors="ignore") as f:
+        yield from f
+    os.remove(out)
+
+
+def timed(name, size, fn):
+    start = time.perf_counter()
+    n = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:22} | {n / elapsed:12,.0f} lines/s | {size / elapsed / 1e6:8.1f} MB/s | {elapsed:7.2f} s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compressed log ingestion benchmark")
+    ap.add_argument("--log", default=os.path.join(HERE, "nemo.log"))
+    ap.add_argument("--repeat", type=int, default=50, help="replicate the log N times")
+    args = ap.parse_args()
+
+    with open(args.log, "rb") as f:
+        data = f.read() * args.repeat
+
+    tmpdir = tempfile.mkdtemp(prefix="bench_compressed_")
+    try:
+        plain = os.path.join(tmpdir, "app.log")
+        with open(plain, "wb") as f:
+            f.write(data)
+        variants = [(".gz", gzip.compress), (".bz2", bz2.compress)]
+        if zstandard is not None:
+            variants.append((".zst", zstandard.ZstdCompressor().compress))
+
+        size = len(data)
+        print(f"{os.path.basename(args.log)} x{args.repeat}: {size / 1e6:.1f} MB uncompressed\n")
+        timed("plain", size, lambda: consume(iter_lines(plain)))
+
+        for ext, compress in variants:
+            path = plain + ext
+            with open(path, "wb") as f:
+                f.write(compress(data))
+            print(f"\n{ext} ({os.path.getsize(path) / 1e6:.1f} MB on disk)")
+            timed(f"{ext} streamed", size, lambda: consume(iter_lines(path)))
+            timed(f"{ext} inline", size, lambda: consume(inline_lines(path)))
+            timed(f"{ext} to-disk", size, lambda: consume(to_disk_lines(path, tmpdir)))
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# bench_models.py
+# Latency / size / agreement for every trained autoencoder variant.
+# Agreement is measured against the LSTM baseline on the training series
+# plus a copy with injected spikes (--nab adds the bundled NAB CSVs; they
+# sit far outside the scaler's range, so every model flags every window).
+import argparse
+import csv
+import glob
+import os
+import random
+import time
+
+import numpy as np
+
+from autoencoders import MODELS, model_paths
+from lstm_score import WINDOW, MODELS_DIR, scaler, load_variant
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TRAIN_SERIES = os.path.join(HERE, "sample_timeseries.csv")
+SPIKE_EVERY = 200       # one injected spike per this many points
+SPIKE_SIZE = 4.0        # in standard deviations of the series
+
+NAB_PATTERNS = [
+    "ec2_cpu_utilization_*.csv",
+    "rds_cpu_utilization_*.csv",
+    "grok_asg_anomaly.csv",
+    "iio_us-east-1_*.csv",
+]
+
+
+def load_series(path):
+    with open(path, newline="") as f:
+        return np.array([float(r["value"]) for r in csv.DictReader(f)])
+
+
+def with_spikes(values, every=SPIKE_EVERY, size=SPIKE_SIZE, seed=0):
+    rnd = random.Random(seed)
+    out = values.copy()
+    for i in range(every // 2, len(out), every):
+        out[i] += rnd.choice((-1, 1)) * size * values.std()
+    return out
+
+
+def load_windows(series):
+    out = []
+    for values in series:
+        scaled = scaler.transform(values.reshape(-1, 1)).flatten()
+        n = len(scaled) - WINDOW + 1
+        if n > 0:
+            idx = np.arange(WINDOW)[None, :] + np.arange(n)[:, None]
+            out.append(scaled[idx])
+    return np.concatenate(out).reshape(-1, WINDOW, 1)
+
+
+def bench_variant(name, X, single_limit):
+    model, threshold = load_variant(name)
+    model_path, _ = model_paths(name, MODELS_DIR)
+
+    # per-window latency, the way score_window calls the model
+    n_single = min(single_limit, len(X))
+    start = time.perf_counter()
+    for i in range(n_single):
+        model.predict(X[i:i + 1], verbose=0)
+    single_wps = n_single / (time.perf_counter() - start)
+
+    # batched throughput + flags for the agreement check
+    start = time.perf_counter()
+    recon = model.predict(X, batch_size=256, verbose=0)
+    batch_wps = len(X) / (time.perf_counter() - start)
+
+    mse = np.mean((recon - X) ** 2, axis=(1, 2))
+    return {
+        "single_wps": single_wps,
+        "batch_wps": batch_wps,
+        "params": model.count_params(),
+        "size_kb": os.path.getsize(model_path) / 1e3,
+        "flags": mse > threshold,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Autoencoder model zoo benchmark")
+    ap.add_argument("--models", nargs="+", default=list(MODELS))
+    ap.add_argument("--single-limit", type=int, default=300,
+                    help="windows timed one at a time per model")
+    ap.add_argument("--nab", action="store_true", help="also score the bundled NAB CSVs")
+    args = ap.parse_args()
+
+    train = load_series(TRAIN_SERIES)
+    series = [train, with_spikes(train)]
+    names = ["training series", "training series + spikes"]
+    if args.nab:
+        for pattern in NAB_PATTERNS:
+            for path in sorted(glob.glob(os.path.join(HERE, pattern))):
+                series.append(load_series(path))
+                names.append(os.path.basename(path))
+    X = load_windows(series)
+    print(f"{len(X)} windows from {', '.join(names[:2])}"
+          + (f" and {len(names) - 2} NAB series" if len(names) > 2 else "") + "\n")
+
+    results = {}
+    for name in args.models:
+        if not os.path.exists(model_paths(name, MODELS_DIR)[0]):
+            print(f"skipping {name}: not trained (python lstm_train.py {name})")
+            continue
+        results[name] = bench_variant(name, X, args.single_limit)
+
+    base = results.get("lstm")
+    print(f"{'model':6} | {'params':>8} | {'size KB':>8} | {'win/s 1x':>9} | {'win/s batch':>11} | "
+          f"{'anomalies':>9} | {'agree':>6} | {'recall vs lstm':>14}")
+    print("-" * 95)
+    for name, r in results.items():
+        flags = r["flags"]
+        if base is not None:
+            agree = f"{100 * np.mean(flags == base['flags']):5.1f}%"
+            hits = base["flags"].sum()
+            recall = f"{100 * (flags & base['flags']).sum() / hits:13.1f}%" if hits else f"{'n/a':>14}"
+        else:
+            agree, recall = f"{'n/a':>6}", f"{'n/a':>14}"
+        print(f"{name:6} | {r['params']:8d} | {r['size_kb']:8.0f} | {r['single_wps']:9.0f} | "
+              f"{r['batch_wps']:11.0f} | {int(flags.sum()):9d} | {agree} | {recall}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# bench_pdf.py
+# PDF export time and peak Python memory for large anomaly sets:
+# the streaming pdf_report vs the old one-row-per-anomaly table.
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Preformatted
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+from pdf_report import build_pdf_report, TABLE_STYLE
+from records import AnomalyRecord, AnomalyBuffer
+
+TYPES = [
+    ("CRITICAL SPIKE", "CRITICAL", "Investigate timeout, infinite loop, or network delay."),
+    ("HIGH RESPONSE", "HIGH", "Possible heavy computation or I/O blocking."),
+    ("MEDIUM SPIKE", "MEDIUM", "Possible slow code path, profile and optimize."),
+    ("ERROR", "HIGH", "Check stacktrace and fix exception cause."),
+    ("ANOMALY", "LOW", "Investigate (no clear reason)."),
+]
+
+
+def make_buffer(n, sources=200, seed=0):
+    rnd = random.Random(seed)
+    buf = AnomalyBuffer()
+    for i in range(n):
+        kind, severity, fix = rnd.choice(TYPES)
+        resp = rnd.uniform(10, 900)
+        buf.append(AnomalyRecord(
+            f"2025-11-23T12:{(i // 60) % 60:02d}:{i % 60:02d}",
+            f"service_{rnd.randrange(sources)}.py", i, resp, rnd.random(), kind, fix,
+            f"2025-11-23T12:00:00 file=service.py:{i} resp={resp:.1f} msg='bench'", severity
+        ))
+    return buf
+
+
+def legacy_export(path, records, log_text):
+    # gui_monitor.export_pdf before the streaming report
+    doc = SimpleDocTemplate(path, pagesize=A4, leftMargin=40, rightMargin=40,
+                            topMargin=40, bottomMargin=40)
+    styles = getSampleStyleSheet()
+    story = [Paragraph("<b>Log Monitoring Report</b>", styles["Title"]), Spacer(1, 20)]
+    table_data = [["Timestamp", "Severity", "Message", "File"]]
+    for entry in records:
+        table_data.append([
+            Paragraph(entry.timestamp, styles["Normal"]),
+            Paragraph(entry.anomaly_type, styles["Normal"]),
+            Paragraph(entry.suggested_fix, styles["Normal"]),
+            Paragraph(entry.file, styles["Normal"])
+        ])
+    table = Table(table_data, colWidths=[100, 80, 250, 120], repeatRows=1)
+    table.setStyle(TABLE_STYLE)
+    story.append(table)
+    code_style = ParagraphStyle('Code', fontName='Courier', fontSize=8, leading=10)
+    story.append(Preformatted(log_text, code_style))
+    doc.build(story)
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description="PDF export benchmark")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    ap.add_argument("--legacy-max", type=int, default=10000,
+                    help="skip the legacy export above this many anomalies (it takes minutes)")
+    args = ap.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="bench_pdf_")
+    print(f"{'anomalies':>9} | {'export':10} | {'seconds':>8} | {'peak MB':>8} | {'pdf KB':>8}")
+    print("-" * 56)
+    for n in args.sizes:
+        buf = make_buffer(n)
+        # GUI log box: 3 lines per anomaly
+        log_lines = [f"{r.timestamp} | {r.file} | {r.anomaly_type}" for r in buf for _ in range(3)]
+
+        out = os.path.join(tmpdir, f"stream_{n}.pdf")
+        tail = "\n".join(log_lines[-500:])
+        elapsed, peak = measure(lambda: build_pdf_report(out, buf, tail))
+        print(f"{n:9d} | {'streaming':10} | {elapsed:8.2f} | {peak / 1e6:8.1f} | {os.path.getsize(out) / 1e3:8.0f}")
+
+        if n <= args.legacy_max:
+            out = os.path.join(tmpdir, f"legacy_{n}.pdf")
+            records = list(buf)
+            full_log = "\n".join(log_lines)
+            elapsed, peak = measure(lambda: legacy_export(out, records, full_log))
+            print(f"{n:9d} | {'legacy':10} | {elapsed:8.2f} | {peak / 1e6:8.1f} | {os.path.getsize(out) / 1e3:8.0f}")
+        buf.clear()
+    print(f"\nPDFs written to {tmpdir}")
+
+
+if __name__ == "__main__":
+    main()
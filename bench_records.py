@@ -0,0 +1,110 @@
+# bench_records.py
+# Bytes per record: legacy dicts vs slotted records vs the array-backed buffer.
+import argparse
+import gc
+import os
+import tracemalloc
+
+from parser import LOG_RE, parse_line
+from records import AnomalyRecord, AnomalyBuffer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def legacy_parse_line(line):
+    # parse_line as it was before records.ParsedLine
+    match = LOG_RE.search(line)
+    if not match:
+        return None
+    return {
+        "timestamp": match.group("timestamp"),
+        "source_file": match.group("file"),
+        "line_number": int(match.group("line")),
+        "features": {"resp": float(match.group("resp"))},
+        "raw": line.strip()
+    }
+
+
+def legacy_anomaly(p):
+    return {
+        "timestamp": p["timestamp"],
+        "file": p["source_file"],
+        "line": p["line_number"],
+        "resp": p["features"]["resp"],
+        "mse": 0.5,
+        "anomaly_type": "MEDIUM SPIKE",
+        "suggested_fix": "Possible slow code path, profile and optimize.",
+        "reason": p["raw"]
+    }
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, after - before
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Record memory benchmark")
+    ap.add_argument("--log", default=os.path.join(HERE, "nemo.log"))
+    ap.add_argument("--repeat", type=int, default=10, help="replay the log N times")
+    args = ap.parse_args()
+
+    with open(args.log, encoding="utf-8", errors="ignore") as f:
+        lines = f.readlines() * args.repeat
+
+    n = sum(1 for line in lines if LOG_RE.search(line))
+    print(f"{n} parsed lines from {os.path.basename(args.log)} x{args.repeat}\n")
+
+    results = []
+
+    legacy, size = measure(lambda: [legacy_parse_line(l) for l in lines])
+    results.append(("parsed line: dict", size))
+    _, size = measure(lambda: [parse_line(l) for l in lines])
+    results.append(("parsed line: ParsedLine", size))
+    _, size = measure(lambda: [parse_line(l, offset=0, keep_raw=False) for l in lines])
+    results.append(("parsed line: ParsedLine (offset ref)", size))
+
+    legacy = [p for p in legacy if p]
+    parsed = [p for p in (parse_line(l) for l in lines) if p]
+
+    _, size = measure(lambda: [legacy_anomaly(p) for p in legacy])
+    results.append(("anomaly: dict", size))
+
+    def records():
+        return [AnomalyRecord(p.timestamp, p.source_file, p.line_number, p.resp, 0.5,
+                              "MEDIUM SPIKE", "Possible slow code path, profile and optimize.",
+                              p.raw) for p in parsed]
+    recs = records()
+    _, size = measure(records)
+    results.append(("anomaly: AnomalyRecord", size))
+
+    def buffer():
+        buf = AnomalyBuffer(spill_threshold=len(recs) + 1)
+        for r in recs:
+            buf.append(r)
+        return buf
+    _, size = measure(buffer)
+    results.append(("anomaly: AnomalyBuffer (in memory)", size))
+
+    def spilling_buffer():
+        buf = AnomalyBuffer(spill_threshold=1000)
+        for r in recs:
+            buf.append(r)
+        return buf
+    buf, size = measure(spilling_buffer)
+    results.append(("anomaly: AnomalyBuffer (spill@1000)", size))
+    buf.clear()
+
+    print(f"{'structure':40} | {'bytes/record':>12}")
+    print("-" * 56)
+    for name, size in results:
+        print(f"{name:40} | {size / n:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
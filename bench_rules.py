@@ -0,0 +1,100 @@
+# bench_rules.py
+# Rule throughput: the old hand-written substring chain, a table-driven
+# per-rule substring scan, and the compiled RuleEngine (one scan per line).
+# --extra-rules adds synthetic keyword rules to show how each scales.
+import argparse
+import os
+import time
+
+from parser import parse_line
+from rules import Rule, RuleEngine, load_rules, RULES_PATH
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def legacy_classify(resp_value, raw_msg):
+    # gui_monitor.classify_anomaly before the rule engine
+    raw = (raw_msg or "").lower()
+    if "timeout" in raw or "timed out" in raw or "time out" in raw:
+        return "CRITICAL SPIKE", "Investigate timeout, network latency or infinite loop.", "Timeout in log"
+    if "login" in raw and ("fail" in raw or "incorrect" in raw or "denied" in raw):
+        return "AUTH FAILURE", "Check authentication service and failed attempts.", "Login failure"
+    if "error" in raw or "exception" in raw or "fail" in raw:
+        return "ERROR", "Check stacktrace and fix exception cause.", "Error/Exception in log"
+    if "db" in raw or "database" in raw:
+        return "DB ISSUE", "Inspect DB performance / queries / connections.", "Database related"
+    if resp_value > 500:
+        return "CRITICAL SPIKE", "Investigate timeout, infinite loop, or network delay.", None
+    if resp_value > 100:
+        return "HIGH RESPONSE", "Possible heavy computation or I/O blocking.", None
+    if resp_value > 50:
+        return "MEDIUM SPIKE", "Possible slow code path, profile and optimize.", None
+    return "ANOMALY", "Investigate (no clear reason).", None
+
+
+def naive_classifier(rules):
+    # same table, but every rule does its own substring checks
+    def classify(resp_value, raw_msg):
+        raw = raw_msg or ""
+        low = raw.lower()
+        for rule in rules:
+            if rule.keyword_groups and not all(any(k in low for k in g) for g in rule.keyword_groups):
+                continue
+            if rule.resp_gt is not None and not resp_value > rule.resp_gt:
+                continue
+            if rule.regex is not None and not rule.regex.search(raw):
+                continue
+            return rule.anomaly_type, rule.fix, rule.reason
+    return classify
+
+
+def with_extra_rules(engine, n):
+    extra = [
+        Rule(f"extra_{i}", f"EXTRA {i}", "synthetic rule",
+             keywords=[[f"kwa{i}x", f"kwb{i}y", f"kwc{i}z"]])
+        for i in range(n)
+    ]
+    # synthetic rules go in front so every line has to get past them
+    return RuleEngine(extra + engine.rules)
+
+
+def run(name, classify, items):
+    start = time.perf_counter()
+    out = [classify(resp, raw) for resp, raw in items]
+    elapsed = time.perf_counter() - start
+    print(f"{name:16} | {len(items) / elapsed:12,.0f} lines/s | {elapsed:7.3f} s")
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Rule engine throughput")
+    ap.add_argument("--log", default=os.path.join(HERE, "nemo.log"))
+    ap.add_argument("--rules", default=RULES_PATH)
+    ap.add_argument("--repeat", type=int, default=25, help="replay the log N times")
+    ap.add_argument("--extra-rules", type=int, nargs="*", default=[50, 200],
+                    help="synthetic rule counts to add for the scaling runs")
+    args = ap.parse_args()
+
+    with open(args.log, encoding="utf-8", errors="ignore") as f:
+        parsed = [p for p in map(parse_line, f) if p]
+    items = [(p.resp, p.raw) for p in parsed] * args.repeat
+
+    engine = load_rules(args.rules)
+    print(f"{len(items)} lines from {os.path.basename(args.log)}, {len(engine.rules)} rules\n")
+
+    legacy = run("legacy chain", legacy_classify, items)
+    run("table, naive", naive_classifier(engine.rules), items)
+    compiled = run("rule engine", engine.classify, items)
+
+    same = sum(1 for a, b in zip(legacy, compiled) if a == b)
+    print(f"agreement with legacy chain: {same}/{len(items)}")
+
+    for n in args.extra_rules:
+        big = with_extra_rules(engine, n)
+        print(f"\n+{n} synthetic rules ({len(big.rules)} total)")
+        run("table, naive", naive_classifier(big.rules), items)
+        run("rule engine", big.classify, items)
+
+
+if __name__ == "__main__":
+    main()
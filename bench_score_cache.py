@@ -0,0 +1,80 @@
+# bench_score_cache.py
+# Replays the bundled NAB series through score_window and reports how many
+# model.predict calls the window cache saves.
+import argparse
+import csv
+import glob
+import os
+import time
+
+import lstm_score
+from lstm_score import WINDOW, score_window
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+NAB_PATTERNS = [
+    "ec2_cpu_utilization_*.csv",
+    "rds_cpu_utilization_*.csv",
+    "grok_asg_anomaly.csv",
+    "iio_us-east-1_*.csv",
+]
+
+
+def load_series(path):
+    with open(path, newline="") as f:
+        return [float(row["value"]) for row in csv.DictReader(f)]
+
+
+def bench_file(path, size, tolerance, limit=None):
+    values = load_series(path)
+    cache = lstm_score.configure_cache(size, tolerance)
+
+    n_windows = len(values) - WINDOW + 1
+    if limit:
+        n_windows = min(n_windows, limit)
+
+    start = time.perf_counter()
+    for i in range(n_windows):
+        score_window(values[i:i + WINDOW])
+    elapsed = time.perf_counter() - start
+
+    stats = cache.stats()
+    stats["windows"] = n_windows
+    stats["predict_calls"] = stats["misses"]
+    stats["saved"] = stats["hits"]
+    stats["seconds"] = elapsed
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Window cache benchmark on NAB series")
+    ap.add_argument("--size", type=int, default=lstm_score.CACHE_SIZE)
+    ap.add_argument("--tolerance", type=float, default=lstm_score.CACHE_TOLERANCE)
+    ap.add_argument("--limit", type=int, default=None, help="max windows per dataset")
+    args = ap.parse_args()
+
+    files = []
+    for pattern in NAB_PATTERNS:
+        files.extend(sorted(glob.glob(os.path.join(HERE, pattern))))
+
+    print(f"cache size={args.size} tolerance={args.tolerance}")
+    print(f"{'dataset':42} | {'windows':>7} | {'predict':>7} | {'saved':>7} | {'hit%':>6} | {'evict':>6} | {'sec':>7}")
+    print("-" * 100)
+
+    total_windows = total_saved = 0
+    for path in files:
+        s = bench_file(path, args.size, args.tolerance, args.limit)
+        total_windows += s["windows"]
+        total_saved += s["saved"]
+        print(
+            f"{os.path.basename(path)[:42]:42} | {s['windows']:7d} | {s['predict_calls']:7d} | "
+            f"{s['saved']:7d} | {100 * s['hit_rate']:5.1f}% | {s['evictions']:6d} | {s['seconds']:7.2f}"
+        )
+
+    print("-" * 100)
+    pct = 100 * total_saved / total_windows if total_windows else 0.0
+    print(f"TOTAL: {total_windows} windows, {total_saved} predict calls saved ({pct:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
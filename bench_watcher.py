@@ -0,0 +1,156 @@
+# bench_watcher.py
+# Scan cost and reaction latency of FolderWatcher against the legacy
+# monitor loop (glob every pattern + readlines every file, then sleep 1s)
+# on a folder with many small log files. The watcher runs with the same
+# settings as gui_monitor (POLL_INTERVAL, WATCH_FULL_SCAN_INTERVAL).
+import argparse
+import glob
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from folder_watcher import FolderWatcher
+from log_reader import LOG_PATTERNS
+
+LEGACY_SLEEP = 1.0
+GUI_POLL = 0.2          # gui_monitor.POLL_INTERVAL
+GUI_FULL_SCAN = 1.0     # gui_monitor.WATCH_FULL_SCAN_INTERVAL
+LINE = "2024-01-01 00:00:00 INFO request served resp={:.1f}ms\n"
+
+
+def make_folder(folder, n_files, lines_per_file):
+    for i in range(n_files):
+        with open(os.path.join(folder, f"app_{i:05d}.log"), "w") as f:
+            for j in range(lines_per_file):
+                f.write(LINE.format(100 + j))
+
+
+def legacy_pass(folder, processed):
+    # the pre-watcher monitor_log body, minus the per-line processing
+    files = []
+    for pattern in LOG_PATTERNS:
+        files += glob.glob(os.path.join(folder, pattern))
+    new = 0
+    for file in files:
+        with open(file, "r", encoding="utf-8", errors="ignore") as f:
+            lines = f.readlines()
+        new += len(lines) - processed.get(file, 0)
+        processed[file] = len(lines)
+    return new
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - start, out
+
+
+def reaction(watcher, poll_interval, action, timeout=30.0):
+    """Seconds from `action()` until a poll returns the new line."""
+    action()
+    start = time.perf_counter()
+    time.sleep(random.uniform(0, poll_interval))   # the change lands mid-cycle
+    while time.perf_counter() - start < timeout:
+        if watcher.poll():
+            return time.perf_counter() - start
+        time.sleep(poll_interval)
+    return float("nan")
+
+
+def append_line(path):
+    def action():
+        with open(path, "a") as f:
+            f.write(LINE.format(9999))
+    return action
+
+
+def steady_cost(watcher, poll_interval, duration, hot):
+    """Run the monitor loop for `duration` seconds, appending to the hot files
+    every poll. Returns (busy seconds per wall second, slowest poll)."""
+    busy = 0.0
+    slowest = 0.0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        for p in hot:
+            append_line(p)()
+        took, _ = timed(watcher.poll)
+        busy += took
+        slowest = max(slowest, took)
+        time.sleep(poll_interval)
+    return busy / (time.perf_counter() - start), slowest
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Folder watcher benchmark")
+    ap.add_argument("--files", type=int, default=10000)
+    ap.add_argument("--lines", type=int, default=20, help="lines per file")
+    ap.add_argument("--poll", type=float, default=GUI_POLL, help="watcher poll interval")
+    ap.add_argument("--full-scan", type=float, default=GUI_FULL_SCAN,
+                    help="watcher full-scan interval")
+    ap.add_argument("--hot", type=int, default=4, help="files written to during the steady run")
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds of steady monitoring")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_watcher_")
+    try:
+        make_folder(tmp, args.files, args.lines)
+        print(f"{args.files} files x {args.lines} lines, {args.hot} active; "
+              f"watcher poll {args.poll}s, full scan {args.full_scan}s\n")
+        hot = [os.path.join(tmp, f"app_{i:05d}.log") for i in range(args.hot)]
+
+        # ---- legacy: one pass, then sleep 1s ----
+        processed = {}
+        legacy_first, _ = timed(legacy_pass, tmp, processed)
+        legacy_pass_time = min(timed(legacy_pass, tmp, processed)[0] for _ in range(args.repeat))
+        legacy_cycle = legacy_pass_time + LEGACY_SLEEP
+
+        # ---- watcher ----
+        watcher = FolderWatcher(tmp, full_scan_interval=args.full_scan)
+        try:
+            watch_first, _ = timed(watcher.poll)
+            watch_full = min(timed(watcher._full_scan, time.monotonic())[0]
+                             for _ in range(args.repeat))
+            busy, slowest = steady_cost(watcher, args.poll, args.duration, hot)
+
+            print(f"{'':28} | {'legacy':>10} | {'watcher':>10}")
+            print("-" * 54)
+            print(f"{'first pass (read everything)':28} | {legacy_first * 1e3:8.1f}ms | {watch_first * 1e3:8.1f}ms")
+            print(f"{'full scan':28} | {legacy_pass_time * 1e3:8.1f}ms | {watch_full * 1e3:8.1f}ms")
+            print(f"{'steady: slowest poll':28} | {legacy_pass_time * 1e3:8.1f}ms | {slowest * 1e3:8.1f}ms")
+            print(f"{'steady: scan ms per second':28} | {legacy_pass_time / legacy_cycle * 1e3:8.1f}ms "
+                  f"| {busy * 1e3:8.1f}ms")
+
+            # ---- reaction latency ----
+            # legacy picks a change up on its next pass: on average half a
+            # (pass + sleep) cycle away, worst case a whole cycle
+            # the watcher's latency depends on where in the full-scan cycle the
+            # change lands, so sample each case --repeat times (fresh files)
+            cases = [
+                ("append to hot file", lambda i: append_line(hot[0])),
+                ("append to cold file", lambda i: append_line(
+                    os.path.join(tmp, f"app_{args.files - 1 - i:05d}.log"))),
+                ("new file", lambda i: append_line(os.path.join(tmp, f"new_{i:05d}.log"))),
+            ]
+            print(f"\n{'reaction latency':28} | {'legacy avg':>10} | {'legacy max':>10} "
+                  f"| {'avg':>10} | {'max':>10}")
+            print("-" * 80)
+            for label, make_action in cases:
+                samples = []
+                for i in range(args.repeat):
+                    watcher.poll()
+                    # land the change at a random point of the full-scan cycle
+                    time.sleep(random.uniform(0, args.full_scan))
+                    samples.append(reaction(watcher, args.poll, make_action(i)))
+                print(f"{label:28} | {legacy_cycle / 2 * 1e3:8.0f}ms | {legacy_cycle * 1e3:8.0f}ms "
+                      f"| {sum(samples) / len(samples) * 1e3:8.1f}ms | {max(samples) * 1e3:8.1f}ms")
+        finally:
+            watcher.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
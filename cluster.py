@@ -0,0 +1,597 @@
+# cluster.py
+# Multi-node worker mode.
+#
+#   coordinator: tracks live workers, broadcasts membership, keeps source offsets
+#   worker:      watches a (shared) log folder, processes only the sources the
+#                consistent-hash ring assigns to it, streams anomalies to the sink
+#   sink:        central TCP collector, appends anomalies to one CSV
+#
+# All traffic is newline-delimited JSON over plain TCP. Everything can run
+# on one box for testing:
+#
+#   python cluster.py local --workers 4 --folder watched/
+#
+# or spread over hosts:
+#
+#   python cluster.py coordinator --bind 0.0.0.0:7100
+#   python cluster.py sink --bind 0.0.0.0:7200 --out cluster_report.csv
+#   python cluster.py worker --name w1 --folder /mnt/logs \
+#       --coordinator coord-host:7100 --sink sink-host:7200
+import argparse
+import bisect
+import csv
+import glob
+import hashlib
+import json
+import math
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+from log_reader import LOG_PATTERNS, is_compressed, iter_lines
+from parser import parse_line
+from records import AnomalyRecord, CSV_HEADER
+from rules import get_engine
+
+WINDOW = 50
+VNODES = 64                 # virtual nodes per worker on the ring
+HEARTBEAT_INTERVAL = 1.0
+HEARTBEAT_TIMEOUT = 5.0     # coordinator drops a worker after this much silence
+POLL_INTERVAL = 0.5
+HANDOFF_DELAY = 1.0         # wait after a membership change before claiming sources
+ZSCORE_LIMIT = 4.0
+MAX_READ_BYTES = 4 << 20    # per source per poll, so a new multi-GB file is read in slices
+
+COORDINATOR_PORT = 7100
+SINK_PORT = 7200
+
+
+def parse_addr(text, default_port=None):
+    host, _, port = text.rpartition(":")
+    if not host:
+        return text, default_port
+    return host, int(port)
+
+
+def send_msg(sock, obj):
+    sock.sendall((json.dumps(obj) + "\n").encode("utf-8"))
+
+
+# --------------------
+# Consistent hashing
+# --------------------
+def _hash(key):
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring with virtual nodes. Adding or removing a worker
+    only moves the sources that hash next to it (~1/N of them).
+    """
+
+    def __init__(self, nodes=(), vnodes=VNODES):
+        self.vnodes = vnodes
+        self._keys = []
+        self._owners = {}
+        self.nodes = set()
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for i in range(self.vnodes):
+            h = _hash(f"{node}#{i}")
+            self._owners[h] = node
+            bisect.insort(self._keys, h)
+
+    def remove(self, node):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        for i in range(self.vnodes):
+            h = _hash(f"{node}#{i}")
+            if self._owners.pop(h, None) is not None:
+                self._keys.pop(bisect.bisect_left(self._keys, h))
+
+    def node_for(self, key):
+        if not self._keys:
+            return None
+        i = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._owners[self._keys[i]]
+
+
+# --------------------
+# Coordinator
+# --------------------
+class _CoordinatorHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.request.settimeout(HEARTBEAT_TIMEOUT)
+        name = None
+        try:
+            for raw in self.rfile:
+                msg = json.loads(raw)
+                kind = msg.get("type")
+                if kind == "join":
+                    name = msg["worker"]
+                    self.server.join(name, self.request)
+                elif kind == "offsets":
+                    self.server.update_offsets(msg["offsets"])
+                elif kind == "query_offsets":
+                    self.server.send_offsets(self.request, msg["generation"])
+                elif kind == "leave":
+                    break
+                # anything else (heartbeat) just resets the read timeout
+        except (OSError, ValueError):
+            pass    # timeout / reset / bad json: treat as a dead worker
+        finally:
+            if name is not None:
+                self.server.leave(name, self.request)
+
+
+class Coordinator(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, verbose=True):
+        super().__init__(address, _CoordinatorHandler)
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.workers = {}       # name -> socket
+        self.offsets = {}       # source -> last reported position
+
+    def _log(self, text):
+        if self.verbose:
+            print(f"[coordinator] {text}", flush=True)
+
+    def join(self, name, sock):
+        with self.lock:
+            self.workers[name] = sock
+            self._log(f"{name} joined ({len(self.workers)} workers)")
+            self._broadcast()
+
+    def leave(self, name, sock):
+        with self.lock:
+            if self.workers.get(name) is not sock:
+                return      # already replaced by a reconnect
+            del self.workers[name]
+            self._log(f"{name} left ({len(self.workers)} workers)")
+            self._broadcast()
+
+    def update_offsets(self, offsets):
+        with self.lock:
+            self.offsets.update(offsets)
+
+    def send_offsets(self, sock, generation):
+        with self.lock:
+            msg = {"type": "offsets", "generation": generation, "offsets": dict(self.offsets)}
+            try:
+                send_msg(sock, msg)
+            except OSError:
+                pass
+
+    def _broadcast(self):
+        # caller holds self.lock, so sends to one socket never interleave
+        msg = {"type": "members", "workers": sorted(self.workers)}
+        for sock in list(self.workers.values()):
+            try:
+                send_msg(sock, msg)
+            except OSError:
+                pass
+
+
+# --------------------
+# Sink
+# --------------------
+class _SinkHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            for raw in self.rfile:
+                msg = json.loads(raw)
+                kind = msg.get("type")
+                if kind == "anomalies":
+                    self.server.write(msg["worker"], msg["rows"], msg.get("lines", 0))
+                elif kind == "query":
+                    send_msg(self.request, self.server.totals())
+        except (OSError, ValueError):
+            pass
+
+
+class Sink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, out_path):
+        super().__init__(address, _SinkHandler)
+        self.lock = threading.Lock()
+        self.lines = 0
+        self.anomalies = 0
+        self.per_worker = {}
+        new_file = not os.path.exists(out_path)
+        self._f = open(out_path, "a", newline="")
+        self._w = csv.writer(self._f)
+        if new_file:
+            self._w.writerow(CSV_HEADER + ["worker"])
+
+    def write(self, worker, rows, lines):
+        with self.lock:
+            for row in rows:
+                self._w.writerow(row + [worker])
+            if rows:
+                self._f.flush()
+            self.lines += lines
+            self.anomalies += len(rows)
+            self.per_worker[worker] = self.per_worker.get(worker, 0) + lines
+
+    def totals(self):
+        with self.lock:
+            return {"lines": self.lines, "anomalies": self.anomalies, "per_worker": dict(self.per_worker)}
+
+    def server_close(self):
+        super().server_close()
+        self._f.close()
+
+
+def query_sink(address):
+    with socket.create_connection(address, timeout=5) as sock:
+        send_msg(sock, {"type": "query"})
+        return json.loads(sock.makefile("r").readline())
+
+
+# --------------------
+# Worker
+# --------------------
+class _Detector:
+    """Per-source sliding window: lstm (score_window) or a cheap z-score test."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.buf = deque(maxlen=WINDOW)
+        self._sum = 0.0
+        self._sumsq = 0.0
+        if kind == "lstm":
+            from lstm_score import score_window
+            self._score_window = score_window
+
+    def score(self, resp):
+        """Return the anomaly score if `resp` completes an anomalous window, else None."""
+        if self.kind == "zscore":
+            # running sums keep this O(1) per line
+            result = None
+            if len(self.buf) == WINDOW:
+                mean = self._sum / WINDOW
+                std = math.sqrt(max(self._sumsq / WINDOW - mean * mean, 0.0)) or 1e-9
+                z = abs(resp - mean) / std
+                if z > ZSCORE_LIMIT:
+                    result = z
+                old = self.buf[0]
+                self._sum -= old
+                self._sumsq -= old * old
+            self.buf.append(resp)
+            self._sum += resp
+            self._sumsq += resp * resp
+            return result
+
+        self.buf.append(resp)
+        if len(self.buf) < WINDOW:
+            return None
+        r = self._score_window(list(self.buf))
+        return r["mse"] if r["is_anomaly"] else None
+
+
+class Worker:
+    """
+    Processes the sources of `folder` that the ring assigns to `name`.
+
+    Positions are byte offsets for plain files and line counts for
+    compressed ones, reported to the coordinator after every poll. After a
+    membership change the worker waits `handoff_delay` (so previous owners
+    finish their pass and report), fetches fresh offsets, and only then
+    claims newly assigned sources. Delivery is at-least-once: a previous
+    owner whose pass outlasts the delay may have lines scored twice.
+    """
+
+    def __init__(self, name, folder, coordinator, sink, detector="lstm",
+                 poll_interval=POLL_INTERVAL, handoff_delay=HANDOFF_DELAY, verbose=True):
+        self.name = name
+        self.folder = folder
+        self.coordinator = coordinator
+        self.sink = sink
+        self.detector = detector
+        self.poll_interval = poll_interval
+        self.handoff_delay = handoff_delay
+        self.verbose = verbose
+        self.stop_event = threading.Event()
+        self.joined = threading.Event()
+
+        self._lock = threading.Lock()
+        self._ring = HashRing()
+        self._handoff = {}
+        self._generation = 0            # bumped on every membership change
+        self._handoff_generation = -1   # generation self._handoff was fetched for
+        self._send_lock = threading.Lock()
+
+        self.positions = {}         # owned source -> position
+        self._sigs = {}             # compressed source -> (size, mtime)
+        self._detectors = {}
+        self._reported = {}
+        self._engine = get_engine()
+
+    def _log(self, text):
+        if self.verbose:
+            print(f"[{self.name}] {text}", flush=True)
+
+    def _send_coord(self, obj):
+        with self._send_lock:
+            send_msg(self._coord, obj)
+
+    def _listen(self):
+        try:
+            for raw in self._coord.makefile("r", encoding="utf-8"):
+                msg = json.loads(raw)
+                kind = msg.get("type")
+                if kind == "members":
+                    with self._lock:
+                        self._ring = HashRing(msg["workers"])
+                        self._generation += 1
+                        generation = self._generation
+                    self._log(f"members: {', '.join(msg['workers'])}")
+                    threading.Timer(self.handoff_delay, self._query_offsets, args=(generation,)).start()
+                    self.joined.set()
+                elif kind == "offsets":
+                    with self._lock:
+                        # stale replies (membership changed again) are ignored
+                        if msg["generation"] == self._generation:
+                            self._handoff = msg["offsets"]
+                            self._handoff_generation = msg["generation"]
+        except (OSError, ValueError):
+            pass
+        if not self.stop_event.is_set():
+            self._log("lost coordinator, stopping")
+            self.stop_event.set()
+
+    def _query_offsets(self, generation):
+        try:
+            self._send_coord({"type": "query_offsets", "generation": generation})
+        except OSError:
+            pass
+
+    def _heartbeat(self):
+        while not self.stop_event.wait(HEARTBEAT_INTERVAL):
+            try:
+                self._send_coord({"type": "heartbeat"})
+            except OSError:
+                return
+
+    def run(self):
+        self._coord = socket.create_connection(self.coordinator)
+        self._sink = socket.create_connection(self.sink)
+        self._send_coord({"type": "join", "worker": self.name})
+        threading.Thread(target=self._listen, daemon=True).start()
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+        self.joined.wait(HEARTBEAT_TIMEOUT)
+        try:
+            while not self.stop_event.is_set():
+                self.poll()
+                self.stop_event.wait(self.poll_interval)
+        finally:
+            try:
+                self._report_offsets(force=True)
+                self._send_coord({"type": "leave"})
+            except OSError:
+                pass
+            self._coord.close()
+            self._sink.close()
+
+    def stop(self):
+        self.stop_event.set()
+
+    # ---- one pass over the folder ----
+    def poll(self):
+        with self._lock:
+            ring, handoff = self._ring, self._handoff
+            settled = self._handoff_generation == self._generation
+
+        files = []
+        for pattern in LOG_PATTERNS:
+            files += glob.glob(os.path.join(self.folder, pattern))
+
+        owned = set()
+        rows, lines = [], 0
+        for path in files:
+            source = os.path.basename(path)
+            if ring.node_for(source) != self.name:
+                continue
+            if source not in self.positions:
+                if not settled:
+                    continue    # newly assigned: wait for fresh offsets
+                self.positions[source] = handoff.get(source, 0)
+                self._detectors[source] = _Detector(self.detector)
+            owned.add(source)
+            try:
+                lines += self._read(path, source, rows)
+            except Exception as e:
+                # half-written archive, file removed mid-pass, ...: skip this
+                # source for now, the others keep flowing
+                self._log(f"error reading {source}: {e}")
+
+        # sources moved to another worker
+        for source in set(self.positions) - owned:
+            del self.positions[source]
+            self._detectors.pop(source, None)
+            self._sigs.pop(source, None)
+            self._reported.pop(source, None)
+
+        if rows or lines:
+            send_msg(self._sink, {"type": "anomalies", "worker": self.name, "rows": rows, "lines": lines})
+        self._report_offsets()
+
+    def _report_offsets(self, force=False):
+        changed = {s: p for s, p in self.positions.items() if self._reported.get(s) != p}
+        if changed or force:
+            self._send_coord({"type": "offsets", "offsets": changed})
+            self._reported.update(changed)
+
+    def _read(self, path, source, rows):
+        pos = self.positions[source]
+        n = 0
+        if is_compressed(path):
+            st = os.stat(path)
+            sig = (st.st_size, st.st_mtime)
+            if self._sigs.get(source) == sig:
+                return 0
+            self._sigs[source] = sig
+            count = 0
+            try:
+                for line in iter_lines(path):
+                    count += 1
+                    if count > pos:
+                        n += self._process(source, line, rows)
+            finally:
+                # a truncated archive still keeps the lines it did yield
+                self.positions[source] = max(pos, count)
+            return n
+
+        size = os.path.getsize(path)
+        if size < pos:
+            pos = 0         # truncated / rotated in place
+        if size == pos:
+            return 0
+        with open(path, "rb") as f:
+            f.seek(pos)
+            data = f.read(min(size - pos, MAX_READ_BYTES))
+        end = data.rfind(b"\n")
+        if end < 0:
+            if len(data) < MAX_READ_BYTES:
+                return 0    # no complete line yet
+            end = len(data) - 1     # one oversized line: move past the fragment
+        for line in data[:end].decode("utf-8", errors="ignore").split("\n"):
+            n += self._process(source, line, rows)
+        self.positions[source] = pos + end + 1
+        return n
+
+    def _process(self, source, line, rows):
+        parsed = parse_line(line)
+        if not parsed:
+            return 0
+        score = self._detectors[source].score(parsed.resp)
+        if score is not None:
+            rule = self._engine.match(parsed.resp, parsed.raw)
+            rows.append(AnomalyRecord(
+                parsed.timestamp, parsed.source_file, parsed.line_number, parsed.resp,
+                float(score), rule.anomaly_type, rule.fix, rule.reason or parsed.raw,
+                rule.severity
+            ).as_row())
+        return 1
+
+
+# --------------------
+# Local mode (everything as separate processes on localhost)
+# --------------------
+def spawn(role, *args):
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), role, *map(str, args)])
+
+
+def wait_for_port(address, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(address, timeout=0.5).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def run_local(n_workers, folder, out_path, detector, coord_port=COORDINATOR_PORT, sink_port=SINK_PORT):
+    procs = [
+        spawn("coordinator", "--bind", f"127.0.0.1:{coord_port}"),
+        spawn("sink", "--bind", f"127.0.0.1:{sink_port}", "--out", out_path),
+    ]
+    wait_for_port(("127.0.0.1", coord_port))
+    wait_for_port(("127.0.0.1", sink_port))
+    for i in range(n_workers):
+        procs.append(spawn("worker", "--name", f"w{i + 1}", "--folder", folder,
+                           "--coordinator", f"127.0.0.1:{coord_port}",
+                           "--sink", f"127.0.0.1:{sink_port}", "--detector", detector))
+    return procs
+
+
+def stop_procs(procs):
+    # workers first so they can report final offsets and leave cleanly
+    for p in reversed(procs):
+        p.terminate()
+        try:
+            p.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            p.kill()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Distributed anomaly detection (coordinator / worker / sink)")
+    sub = ap.add_subparsers(dest="role", required=True)
+
+    p = sub.add_parser("coordinator")
+    p.add_argument("--bind", default=f"0.0.0.0:{COORDINATOR_PORT}")
+
+    p = sub.add_parser("sink")
+    p.add_argument("--bind", default=f"0.0.0.0:{SINK_PORT}")
+    p.add_argument("--out", default="cluster_report.csv")
+
+    p = sub.add_parser("worker")
+    p.add_argument("--name", default=f"{socket.gethostname()}-{os.getpid()}")
+    p.add_argument("--folder", required=True)
+    p.add_argument("--coordinator", default=f"127.0.0.1:{COORDINATOR_PORT}")
+    p.add_argument("--sink", default=f"127.0.0.1:{SINK_PORT}")
+    p.add_argument("--detector", choices=["lstm", "zscore"], default="lstm")
+    p.add_argument("--poll", type=float, default=POLL_INTERVAL)
+    p.add_argument("--handoff-delay", type=float, default=HANDOFF_DELAY)
+
+    p = sub.add_parser("local", help="coordinator + sink + N workers on localhost")
+    p.add_argument("--workers", type=int, default=2)
+    p.add_argument("--folder", required=True)
+    p.add_argument("--out", default="cluster_report.csv")
+    p.add_argument("--detector", choices=["lstm", "zscore"], default="lstm")
+
+    args = ap.parse_args()
+
+    if args.role == "coordinator":
+        server = Coordinator(parse_addr(args.bind, COORDINATOR_PORT))
+        print(f"[coordinator] listening on {args.bind}", flush=True)
+        server.serve_forever()
+    elif args.role == "sink":
+        server = Sink(parse_addr(args.bind, SINK_PORT), args.out)
+        print(f"[sink] listening on {args.bind}, writing {args.out}", flush=True)
+        server.serve_forever()
+    elif args.role == "worker":
+        worker = Worker(args.name, args.folder,
+                        parse_addr(args.coordinator, COORDINATOR_PORT),
+                        parse_addr(args.sink, SINK_PORT),
+                        detector=args.detector, poll_interval=args.poll,
+                        handoff_delay=args.handoff_delay)
+        signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+        try:
+            worker.run()
+        except KeyboardInterrupt:
+            worker.stop()
+    else:
+        procs = run_local(args.workers, args.folder, args.out, args.detector)
+        try:
+            while all(p.poll() is None for p in procs):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop_procs(procs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# folder_watcher.py
+import fnmatch
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from log_reader import LOG_PATTERNS, is_compressed, iter_lines
+
+MAX_READERS = 8             # bounded reader pool
+FULL_SCAN_INTERVAL = 1.0    # seconds between full os.scandir passes
+HOT_WINDOW = 30.0           # files changed this recently are re-stat'ed every poll
+MAX_READ_BYTES = 4 << 20    # per file per poll, so one busy file cannot starve the rest
+                            # (decompressed bytes for archives)
+
+
+class _FileState:
+    __slots__ = ("path", "ino", "size", "mtime_ns", "position", "last_change", "pending",
+                 "stream")
+
+    def __init__(self, path):
+        self.path = path
+        self.ino = None
+        self.size = -1
+        self.mtime_ns = -1
+        self.position = 0       # byte offset (plain) or lines consumed (compressed)
+        self.last_change = 0.0
+        self.pending = False    # more data left than MAX_READ_BYTES allowed
+        self.stream = None      # open iter_lines() of a partly read archive
+
+    def close_stream(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+
+class FolderWatcher:
+    """
+    Incremental folder watcher built on os.scandir stat snapshots.
+
+    poll() returns [(path, new_lines)] for files that changed since the last
+    poll, most recently changed first. Only changed files are read, reads
+    fan out over a bounded thread pool, and lines of one file are always
+    returned in order (one read per file per poll, from its saved offset).
+
+    Scheduling is tiered: files that changed within `hot_window` seconds
+    are stat'ed every poll, the whole tree is re-scanned every
+    `full_scan_interval` seconds, and a directory whose mtime moved (file
+    created / removed / renamed) triggers an immediate re-scan.
+    """
+
+    def __init__(self, root, include=LOG_PATTERNS, exclude=(), recursive=False,
+                 max_readers=MAX_READERS, full_scan_interval=FULL_SCAN_INTERVAL,
+                 hot_window=HOT_WINDOW, start_at_end=False):
+        self.root = root
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.recursive = recursive
+        self.full_scan_interval = full_scan_interval
+        self.hot_window = hot_window
+        self.start_at_end = start_at_end
+        self._files = {}
+        self._dirs = {}
+        self._last_full = None
+        self._max_readers = max_readers
+        self._pool = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix="log-reader")
+
+    # ---- filtering ----
+    def _excluded(self, rel, name):
+        return any(fnmatch.fnmatch(rel, p) or fnmatch.fnmatch(name, p) for p in self.exclude)
+
+    def _wanted(self, rel, name):
+        return any(fnmatch.fnmatch(name, p) for p in self.include) and not self._excluded(rel, name)
+
+    # ---- scanning ----
+    def _walk(self):
+        """Yield (path, stat) for every wanted file; records directory mtimes."""
+        dirs = {}
+        stack = [self.root]
+        cut = len(os.path.join(self.root, ""))
+        while stack:
+            d = stack.pop()
+            try:
+                dirs[d] = os.stat(d).st_mtime_ns
+                it = os.scandir(d)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    rel = entry.path[cut:]
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.recursive and not self._excluded(rel, entry.name):
+                                stack.append(entry.path)
+                        elif entry.is_file() and self._wanted(rel, entry.name):
+                            yield entry.path, entry.stat()
+                    except OSError:
+                        continue
+        self._dirs = dirs
+
+    def _dirs_changed(self):
+        for d, mtime_ns in self._dirs.items():
+            try:
+                if os.stat(d).st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _update(self, state, st, now, first_scan):
+        if (st.st_ino, st.st_size, st.st_mtime_ns) == (state.ino, state.size, state.mtime_ns):
+            return False
+        state.close_stream()        # archive changed under us: resume by line count
+        if state.ino is not None and (st.st_ino != state.ino or st.st_size < state.size):
+            state.position = 0      # rotated or truncated: start over
+        elif state.ino is None and first_scan and self.start_at_end and not is_compressed(state.path):
+            state.position = st.st_size
+        state.ino, state.size, state.mtime_ns = st.st_ino, st.st_size, st.st_mtime_ns
+        # files already there at start-up only become hot once they change
+        state.last_change = 0.0 if first_scan else now
+        return True
+
+    def _full_scan(self, now):
+        first_scan = self._last_full is None
+        self._last_full = now
+        seen = set()
+        changed = []
+        for path, st in self._walk():
+            seen.add(path)
+            state = self._files.get(path)
+            if state is None:
+                state = self._files[path] = _FileState(path)
+            if self._update(state, st, now, first_scan):
+                changed.append(state)
+        for path in set(self._files) - seen:
+            self._files.pop(path).close_stream()
+        return changed
+
+    def _hot_scan(self, now):
+        changed = []
+        for path, state in list(self._files.items()):
+            if now - state.last_change > self.hot_window:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._files.pop(path).close_stream()
+                continue
+            if self._update(state, st, now, False):
+                changed.append(state)
+        return changed
+
+    # ---- reading ----
+    def _read_compressed(self, state):
+        # archives cannot be seeked: keep the decompressing stream open
+        # between polls while it is over budget, otherwise skip the lines
+        # already consumed
+        stream = state.stream
+        state.stream = None
+        try:
+            if stream is None:
+                stream = iter_lines(state.path)
+                for _ in itertools.islice(stream, state.position):
+                    pass
+            lines = []
+            budget = MAX_READ_BYTES
+            for line in stream:
+                lines.append(line)
+                budget -= len(line)
+                if budget <= 0:
+                    break
+            else:
+                stream.close()
+                stream = None
+        except Exception:
+            if stream is not None:
+                stream.close()
+            raise
+        state.stream = stream
+        state.pending = stream is not None
+        state.position += len(lines)
+        return lines
+
+    def _read(self, state):
+        if is_compressed(state.path):
+            return self._read_compressed(state)
+
+        with open(state.path, "rb") as f:
+            f.seek(state.position)
+            data = f.read(MAX_READ_BYTES)
+        state.pending = len(data) == MAX_READ_BYTES
+        end = data.rfind(b"\n")
+        if end < 0:
+            if not state.pending:
+                return []   # only a partial line so far
+            # a single line longer than MAX_READ_BYTES: hand the fragment on
+            # rather than re-reading the same chunk forever
+            end = len(data) - 1
+        state.position += end + 1
+        return data[:end + 1].decode("utf-8", errors="ignore").splitlines(keepends=True)
+
+    def _read_batch(self, states):
+        out = []
+        for state in states:
+            try:
+                lines = self._read(state)
+            except Exception:
+                # vanished between stat and read, half-written archive
+                # (EOFError / ZstdError), ...: _read only moves the position
+                # on success, so the file is retried once it changes again.
+                # Never let it cost the other files their lines.
+                continue
+            if lines:
+                out.append((state.path, lines))
+        return out
+
+    def poll(self):
+        now = time.monotonic()
+        if (self._last_full is None or now - self._last_full >= self.full_scan_interval
+                or self._dirs_changed()):
+            changed = self._full_scan(now)
+        else:
+            changed = self._hot_scan(now)
+
+        todo = {s.path: s for s in changed}
+        for state in self._files.values():
+            if state.pending:
+                todo[state.path] = state
+        if not todo:
+            return []
+
+        # most recently changed first; contiguous batches (rather than one
+        # task per file) keep pool overhead flat when thousands changed
+        ordered = sorted(todo.values(), key=lambda s: s.mtime_ns, reverse=True)
+        size = -(-len(ordered) // self._max_readers)
+        batches = [ordered[i:i + size] for i in range(0, len(ordered), size)]
+        results = []
+        for batch in self._pool.map(self._read_batch, batches):
+            results.extend(batch)
+
+        # every open archive stream holds a decompressor thread: keep at most
+        # max_readers, the rest resume by skipping lines on their next read
+        for state in [s for s in ordered if s.stream is not None][self._max_readers:]:
+            state.close_stream()
+        return results
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        for state in self._files.values():
+            state.close_stream()
+
+    def __len__(self):
+        return len(self._files)
@@ -26,7 +26,7 @@ def run_detection(path):
             if not parsed:
                 continue
 
-            resp = parsed["features"]["resp"]
+            resp = parsed.resp
             buffer.append(resp)
 
             river_result = detect_river(raw)
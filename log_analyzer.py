@@ -1,8 +1,10 @@
 # log_analyzer.py
 import os
-import pandas as pd
 from parser import parse_line
+from log_reader import iter_lines_with_offsets
+from records import read_raw_line
 from lstm_score import score_window
+from rules import get_engine
 
 WINDOW = 50
 
@@ -11,58 +13,48 @@ def analyze_log_file(log_path, report_path="anomaly_report.txt"):
 
     print(f"Reading log file: {log_path}")
 
-    # ---- STEP 1: Read & parse log file ----
-    with open(log_path, "r") as f:
-        for line in f:
-            parsed = parse_line(line)
-            if parsed:
-                entries.append(parsed)
+    # ---- STEP 1: Read & parse log file (.gz/.bz2/.zst streamed) ----
+    # plain files keep only the byte offset of each line; the raw text is
+    # re-read for the few flagged windows (compressed files keep it)
+    for offset, line in iter_lines_with_offsets(log_path):
+        parsed = parse_line(line, offset=offset, keep_raw=False)
+        if parsed:
+            entries.append(parsed)
 
     if len(entries) < WINDOW:
         print("Not enough entries to form a 50-value window!")
         return
 
-    df = pd.DataFrame(entries)
-
-    print(f"Loaded {len(df)} log entries.")
+    print(f"Loaded {len(entries)} log entries.")
 
     # ---- STEP 2: Sliding windows ----
+    engine = get_engine()
+    resp_series = [e.resp for e in entries]
     report_lines = []
-    for i in range(len(df) - WINDOW):
-        window_df = df.iloc[i:i + WINDOW]
-
-        resp_values = [x["features"]["resp"] for x in window_df.to_dict("records")]
+    for i in range(len(entries) - WINDOW):
+        resp_values = resp_series[i:i + WINDOW]
 
         lstm_result = score_window(resp_values)
 
         if lstm_result["is_anomaly"]:
-            last = window_df.iloc[-1]
+            last = entries[i + WINDOW - 1]
 
-            resp_value = last["features"]["resp"]
+            resp_value = last.resp
 
             # ---- Determine anomaly type ----
-            if resp_value > 500:
-                anomaly_type = "CRITICAL SPIKE"
-                fix = "Investigate timeout, network delay, or infinite loop."
-            elif resp_value > 100:
-                anomaly_type = "HIGH RESPONSE TIME"
-                fix = "May be caused by heavy computation or I/O blocking."
-            elif resp_value > 50:
-                anomaly_type = "MEDIUM SPIKE"
-                fix = "Check function performance or system load."
-            else:
-                anomaly_type = "UNKNOWN ANOMALY"
-                fix = "General anomaly detected."
+            raw = last.raw if last.raw is not None else read_raw_line(log_path, last.offset)
+            rule = engine.match(resp_value, raw)
 
             report_lines.append(
                 "Anomaly Detected:\n"
-                f"  Timestamp: {last['timestamp']}\n"
-                f"  File: {last['source_file']}\n"
-                f"  Line: {last['line_number']}\n"
+                f"  Timestamp: {last.timestamp}\n"
+                f"  File: {last.source_file}\n"
+                f"  Line: {last.line_number}\n"
                 f"  Resp Value: {resp_value}\n"
                 f"  LSTM MSE: {lstm_result['mse']:.4f}\n"
-                f"  Category: {anomaly_type}\n"
-                f"  Suggested Fix: {fix}\n"
+                f"  Category: {rule.anomaly_type}\n"
+                f"  Severity: {rule.severity}\n"
+                f"  Suggested Fix: {rule.fix}\n"
                 f"------------------------------------------------------------\n"
             )
 
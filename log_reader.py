@@ -0,0 +1,125 @@
+# log_reader.py
+import bz2
+import codecs
+import gzip
+import queue
+import threading
+
+try:
+    import zstandard
+except ImportError:         # optional: only needed for .zst logs
+    zstandard = None
+
+CHUNK_SIZE = 1 << 20        # decompressed bytes per chunk
+QUEUE_DEPTH = 8             # chunks buffered ahead of the parser
+
+COMPRESSED_EXTS = (".gz", ".bz2", ".zst")
+LOG_PATTERNS = ("*.log", "*.txt", "*.csv") + tuple("*" + ext for ext in COMPRESSED_EXTS)
+
+_EOF = object()
+
+
+def is_compressed(path):
+    return path.lower().endswith(COMPRESSED_EXTS)
+
+
+def open_binary(path):
+    """Open `path` for binary reading, decompressing by extension."""
+    p = path.lower()
+    if p.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if p.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    if p.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("Reading .zst logs requires the 'zstandard' package (pip install zstandard)")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def _put(out, item, stop):
+    # block on a full queue, but give up once the consumer has gone away
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+def _produce(path, chunk_size, out, stop):
+    # runs in the background thread: decompress into `out` until EOF or stop
+    try:
+        with open_binary(path) as f:
+            while not stop.is_set():
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                _put(out, chunk, stop)
+    except Exception as e:
+        _put(out, e, stop)
+        return
+    _put(out, _EOF, stop)
+
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE, queue_depth=QUEUE_DEPTH):
+    """
+    Yield decompressed byte chunks of `path`. Decompression runs in a
+    background thread (zlib/bz2 release the GIL) so it overlaps with
+    whatever the caller does with the previous chunk.
+    """
+    out = queue.Queue(maxsize=queue_depth)
+    stop = threading.Event()
+    worker = threading.Thread(target=_produce, args=(path, chunk_size, out, stop), daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = out.get()
+            if item is _EOF:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def iter_lines(path, chunk_size=CHUNK_SIZE, queue_depth=QUEUE_DEPTH):
+    """
+    Yield text lines (with line endings) from a plain or compressed log.
+    Compressed files are streamed; nothing is written to disk.
+    """
+    if not is_compressed(path):
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            yield from f
+        return
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    pending = ""
+    for chunk in iter_chunks(path, chunk_size, queue_depth):
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        # last piece is a partial line (or ""): carry it into the next chunk
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def iter_lines_with_offsets(path, chunk_size=CHUNK_SIZE, queue_depth=QUEUE_DEPTH):
+    """
+    Like iter_lines, but yields (byte_offset, line). Plain files report the
+    offset the line starts at (see records.read_raw_line); compressed files
+    cannot be seeked into and report None.
+    """
+    if is_compressed(path):
+        for line in iter_lines(path, chunk_size, queue_depth):
+            yield None, line
+        return
+
+    offset = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            yield offset, raw.decode("utf-8", errors="ignore")
+            offset += len(raw)
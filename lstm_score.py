@@ -3,6 +3,9 @@ import numpy as np
 import joblib
 from tensorflow.keras.models import load_model
 
+from window_cache import WindowCache, CACHE_SIZE, CACHE_TOLERANCE
+from autoencoders import model_paths
+
 WINDOW = 50
 
 # Load trained components
@@ -10,21 +13,69 @@ import os
 import tensorflow as tf
 
 BASE = os.path.dirname(os.path.dirname(__file__))   # go up from src/
+MODELS_DIR = os.path.join(BASE, "models")
+
+# which autoencoder to serve: lstm (default), gru, conv or dense
+MODEL_NAME = os.environ.get("ANOMALY_MODEL", "lstm")
 
-scaler = joblib.load(os.path.join(BASE, "models", "scaler.joblib"))
-threshold = joblib.load(os.path.join(BASE, "models", "lstm_threshold.joblib"))
+scaler = joblib.load(os.path.join(MODELS_DIR, "scaler.joblib"))
 
 
 def mse_loss(y_true, y_pred):
     return tf.reduce_mean(tf.math.squared_difference(y_true, y_pred))
 
-model = load_model(
-    os.path.join(BASE, "models", "lstm_autoencoder.h5"),
-    compile=False   # IMPORTANT: prevents Keras from trying to load 'mse'
-)
 
-# Now compile manually (optional)
-model.compile(optimizer="adam", loss=mse_loss)
+def load_variant(name):
+    """Load a trained autoencoder and its threshold (see autoencoders.MODELS)."""
+    model_path, threshold_path = model_paths(name, MODELS_DIR)
+    m = load_model(
+        model_path,
+        compile=False   # IMPORTANT: prevents Keras from trying to load 'mse'
+    )
+    # Now compile manually (optional)
+    m.compile(optimizer="adam", loss=mse_loss)
+    return m, joblib.load(threshold_path)
+
+
+def _servable(name):
+    # ANOMALY_MODEL names an untrained or unknown variant: serve the LSTM
+    # rather than failing at import
+    try:
+        model_path, _ = model_paths(name, MODELS_DIR)
+    except ValueError as e:
+        print(f"{e}; falling back to lstm")
+        return "lstm"
+    if name != "lstm" and not os.path.exists(model_path):
+        print(f"Model '{name}' not trained ({model_path} missing); falling back to lstm. "
+              f"Train it with: python lstm_train.py {name}")
+        return "lstm"
+    return name
+
+
+MODEL_NAME = _servable(MODEL_NAME)
+model, threshold = load_variant(MODEL_NAME)
+
+# LRU cache of reconstructions for repeated / flat windows
+cache = WindowCache(CACHE_SIZE, CACHE_TOLERANCE)
+
+
+def select_model(name):
+    """Switch the served model at runtime (clears the window cache)."""
+    global model, threshold, MODEL_NAME
+    model, threshold = load_variant(name)
+    MODEL_NAME = name
+    cache.clear()
+
+
+def configure_cache(maxsize=CACHE_SIZE, tolerance=CACHE_TOLERANCE):
+    """Replace the window cache (maxsize=0 disables caching)."""
+    global cache
+    cache = WindowCache(maxsize, tolerance)
+    return cache
+
+
+def cache_stats():
+    return cache.stats()
 
 
 def score_window(window_values):
@@ -43,8 +94,13 @@ def score_window(window_values):
     # Scale using saved scaler
     scaled = scaler.transform(arr).reshape(1, WINDOW, 1)
 
-    # Reconstruct with autoencoder
-    recon = model.predict(scaled, verbose=0)
+    # Reconstruct with autoencoder (reuse the cached reconstruction when
+    # the quantized window was already seen)
+    key = cache.key(scaled)
+    recon = cache.get(key)
+    if recon is None:
+        recon = model.predict(scaled, verbose=0)
+        cache.put(key, recon)
 
     # Calculate reconstruction MSE
     mse = float(np.mean((recon - scaled)**2))
@@ -1,12 +1,12 @@
 # lstm_train.py
 import numpy as np
 import pandas as pd
-from tensorflow.keras import layers, models
 from sklearn.preprocessing import StandardScaler
 import joblib
 import os
+import sys
 
-WINDOW = 50
+from autoencoders import MODELS, WINDOW, model_paths
 
 # ------------------------------
 # LOAD CSV FILE
@@ -35,34 +35,33 @@ def make_windows(arr):
 X = make_windows(scaled_series)
 
 # ------------------------------
-# LSTM AUTOENCODER
+# TRAIN EVERY VARIANT (same data, same window)
+#   python lstm_train.py            -> all of autoencoders.MODELS
+#   python lstm_train.py lstm conv  -> only those
 # ------------------------------
-inp = layers.Input(shape=(WINDOW, 1))
-x = layers.LSTM(64, return_sequences=True)(inp)
-x = layers.LSTM(32)(x)
-x = layers.RepeatVector(WINDOW)(x)
-x = layers.LSTM(32, return_sequences=True)(x)
-x = layers.LSTM(64, return_sequences=True)(x)
-out = layers.TimeDistributed(layers.Dense(1))(x)
+variants = sys.argv[1:] or list(MODELS)
 
-model = models.Model(inp, out)
-model.compile(optimizer="adam", loss="mse")
+for name in variants:
+    model_path, threshold_path = model_paths(name, "../models")
 
-# ------------------------------
-# TRAIN
-# ------------------------------
-model.fit(X, X, epochs=5, batch_size=32)
+    model = MODELS[name](WINDOW)
+    model.compile(optimizer="adam", loss="mse")
 
-# ------------------------------
-# THRESHOLD CALCULATION
-# ------------------------------
-recon = model.predict(X)
-mse = np.mean((recon - X) ** 2, axis=(1, 2))
-threshold = mse.mean() + 3 * mse.std()
+    # ------------------------------
+    # TRAIN
+    # ------------------------------
+    model.fit(X, X, epochs=5, batch_size=32)
+
+    # ------------------------------
+    # THRESHOLD CALCULATION
+    # ------------------------------
+    recon = model.predict(X)
+    mse = np.mean((recon - X) ** 2, axis=(1, 2))
+    threshold = mse.mean() + 3 * mse.std()
 
-joblib.dump(threshold, "../models/lstm_threshold.joblib")
+    joblib.dump(threshold, threshold_path)
 
-# save trained autoencoder
-model.save("../models/lstm_autoencoder.h5")
+    # save trained autoencoder
+    model.save(model_path)
 
-print("TRAINED. Threshold:", threshold)
+    print(f"TRAINED {name}. Threshold:", threshold)
@@ -1,19 +1,28 @@
 # parser.py
 import re
 
+from records import ParsedLine
+
 LOG_RE = re.compile(
     r'(?P<timestamp>[\d\-:T\.]+)\s+file=(?P<file>[^:]+):(?P<line>\d+)\s+resp=(?P<resp>[\d\.]+)'
 )
 
-def parse_line(line: str):
+def parse_line(line: str, offset=None, keep_raw=True):
+    """
+    Parse one log line into a ParsedLine (or None if it does not match).
+
+    Pass keep_raw=False together with the line's byte `offset` to keep
+    only a reference to the raw text (see records.read_raw_line).
+    """
     match = LOG_RE.search(line)
     if not match:
         return None
-    
-    return {
-        "timestamp": match.group("timestamp"),
-        "source_file": match.group("file"),
-        "line_number": int(match.group("line")),
-        "features": {"resp": float(match.group("resp"))},
-        "raw": line.strip()
-    }
+
+    return ParsedLine(
+        match.group("timestamp"),
+        match.group("file"),
+        int(match.group("line")),
+        float(match.group("resp")),
+        raw=line.strip() if keep_raw or offset is None else None,
+        offset=offset,
+    )
@@ -0,0 +1,171 @@
+# pdf_report.py
+import datetime
+import heapq
+from collections import Counter
+from xml.sax.saxutils import escape
+
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Preformatted
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+
+APPENDIX_LIMIT = 2000       # raw anomaly rows listed after the summaries
+ROWS_PER_TABLE = 40         # appendix rows per Table (~one page each)
+TOP_N = 20                  # top incidents / sources listed
+LOG_TAIL_LINES = 500        # lines of the GUI log appended at the end
+PROGRESS_EVERY = 1000       # rows between progress callbacks
+
+TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, 0), 11),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+])
+
+
+def _noop(phase, done, total):
+    pass
+
+
+def summarize(records, total=0, top_n=TOP_N, progress=_noop):
+    """
+    One streaming pass over `records`: counts per source / type / severity
+    and the top_n incidents by MSE. Memory is O(sources + top_n).
+    """
+    by_source, by_type, by_severity = Counter(), Counter(), Counter()
+    top = []        # min-heap of (mse, seq, record)
+    n = 0
+    for n, r in enumerate(records, 1):
+        by_source[r.file] += 1
+        by_type[r.anomaly_type] += 1
+        by_severity[r.severity] += 1
+        item = (r.mse, n, r)
+        if len(top) < top_n:
+            heapq.heappush(top, item)
+        elif item > top[0]:
+            heapq.heapreplace(top, item)
+        if n % PROGRESS_EVERY == 0:
+            progress("summarizing", n, total)
+    return {
+        "count": n,
+        "by_source": by_source,
+        "by_type": by_type,
+        "by_severity": by_severity,
+        "top": [r for _, _, r in sorted(top, reverse=True)],
+    }
+
+
+def _table(rows, col_widths):
+    t = Table(rows, colWidths=col_widths, repeatRows=1)
+    t.setStyle(TABLE_STYLE)
+    return t
+
+
+def _counts_table(title, counter, limit, styles):
+    rows = [[title, "Anomalies"]]
+    shown = counter.most_common(limit)
+    rows += [[Paragraph(escape(str(k)), styles["Normal"]), v] for k, v in shown]
+    other = sum(counter.values()) - sum(v for _, v in shown)
+    if other:
+        rows.append([f"({len(counter) - len(shown)} more)", other])
+    return _table(rows, [350, 100])
+
+
+def build_pdf_report(path, anomalies, log_text="", progress=_noop,
+                     appendix_limit=APPENDIX_LIMIT, top_n=TOP_N):
+    """
+    Write the audit PDF for an AnomalyBuffer. Safe to run off the Tk thread.
+
+    Rows are streamed from the buffer's spill file twice: once for the
+    summaries, once for the capped appendix. Nothing proportional to the
+    number of anomalies is held in memory. The buffer must not be cleared
+    while this runs (gui_monitor refuses to restart monitoring meanwhile).
+    progress(phase, done, total) is called from the calling thread.
+    """
+    total = anomalies.snapshot()
+    styles = getSampleStyleSheet()
+    cell = styles["Normal"]
+
+    summary = summarize(anomalies.iter_spilled(total), total, top_n, progress)
+
+    story = []
+    story.append(Paragraph("<b>Log Monitoring Report</b>", styles["Title"]))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                           cell))
+    story.append(Paragraph(f"Total anomalies: {summary['count']}", cell))
+    story.append(Spacer(1, 20))
+
+    # ---- aggregated summaries ----
+    story.append(Paragraph("<b>By Severity</b>", styles["Heading2"]))
+    story.append(_counts_table("Severity", summary["by_severity"], None, styles))
+    story.append(Spacer(1, 12))
+
+    story.append(Paragraph("<b>By Anomaly Type</b>", styles["Heading2"]))
+    story.append(_counts_table("Type", summary["by_type"], None, styles))
+    story.append(Spacer(1, 12))
+
+    story.append(Paragraph("<b>By Source</b>", styles["Heading2"]))
+    story.append(_counts_table("File", summary["by_source"], top_n, styles))
+    story.append(Spacer(1, 12))
+
+    story.append(Paragraph(f"<b>Top {len(summary['top'])} Incidents (by MSE)</b>", styles["Heading2"]))
+    rows = [["Timestamp", "Type", "File:Line", "Resp", "MSE"]]
+    for r in summary["top"]:
+        rows.append([
+            Paragraph(escape(r.timestamp), cell),
+            Paragraph(escape(r.anomaly_type), cell),
+            Paragraph(escape(f"{r.file}:{r.line}"), cell),
+            f"{r.resp:.2f}",
+            f"{r.mse:.4f}",
+        ])
+    story.append(_table(rows, [100, 100, 170, 60, 70]))
+    story.append(Spacer(1, 20))
+
+    # ---- capped raw appendix, one Table per page-sized chunk ----
+    shown = min(total, appendix_limit)
+    story.append(Paragraph("<b>Anomaly Appendix</b>", styles["Heading2"]))
+    if shown < total:
+        story.append(Paragraph(
+            f"Showing the first {shown} of {total} anomalies. Use Download CSV for the full list.", cell))
+    story.append(Spacer(1, 6))
+
+    header = ["Timestamp", "Severity", "Message", "File"]
+    chunk = [header]
+    for n, entry in enumerate(anomalies.iter_spilled(shown), 1):
+        chunk.append([
+            Paragraph(escape(entry.timestamp), cell),
+            Paragraph(escape(entry.anomaly_type), cell),
+            Paragraph(escape(entry.suggested_fix), cell),
+            Paragraph(escape(entry.file), cell),
+        ])
+        if len(chunk) > ROWS_PER_TABLE:
+            story.append(_table(chunk, [100, 80, 250, 120]))
+            chunk = [header]
+        if n % PROGRESS_EVERY == 0:
+            progress("appendix", n, shown)
+    if len(chunk) > 1:
+        story.append(_table(chunk, [100, 80, 250, 120]))
+    story.append(Spacer(1, 20))
+
+    # ---- log tail ----
+    if log_text:
+        story.append(Paragraph(f"<b>Log Contents (last {LOG_TAIL_LINES} lines)</b>", styles["Heading2"]))
+        story.append(Spacer(1, 6))
+        code_style = ParagraphStyle('Code', fontName='Courier', fontSize=8, leading=10)
+        story.append(Preformatted(log_text, code_style))
+
+    doc = SimpleDocTemplate(path, pagesize=A4,
+                            leftMargin=40, rightMargin=40,
+                            topMargin=40, bottomMargin=40)
+
+    def on_page(canvas, doc):
+        progress("rendering", doc.page, 0)
+
+    doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+    progress("done", total, total)
+    return summary
@@ -0,0 +1,234 @@
+# records.py
+import atexit
+import csv
+import os
+import sys
+import tempfile
+import threading
+from array import array
+
+CSV_HEADER = [
+    "timestamp", "file", "line", "resp", "mse",
+    "anomaly_type", "suggested_fix", "reason", "severity"
+]
+
+SPILL_THRESHOLD = 10000        # anomalies kept in memory before spilling to disk
+
+# temp spill files created by buffers; whatever close()/clear() missed is
+# removed at interpreter exit (they can be large and hold raw log lines)
+_owned_spills = set()
+
+
+def _remove_owned_spills():
+    for path in list(_owned_spills):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        _owned_spills.discard(path)
+
+
+atexit.register(_remove_owned_spills)
+
+
+class ParsedLine:
+    """
+    One parsed log line. Replaces the per-line dict (+ nested features dict)
+    that parse_line used to return.
+
+    `raw` is optional: bulk readers can pass the byte offset of the line
+    instead and resolve it later with read_raw_line().
+    """
+    __slots__ = ("timestamp", "source_file", "line_number", "resp", "raw", "offset")
+
+    def __init__(self, timestamp, source_file, line_number, resp, raw=None, offset=None):
+        self.timestamp = timestamp
+        self.source_file = sys.intern(source_file)
+        self.line_number = line_number
+        self.resp = resp
+        self.raw = raw
+        self.offset = offset
+
+    @property
+    def features(self):
+        # River models expect a dict of features
+        return {"resp": self.resp}
+
+    def __repr__(self):
+        return (f"ParsedLine({self.timestamp!r}, {self.source_file!r}, "
+                f"{self.line_number}, resp={self.resp})")
+
+
+def read_raw_line(path, offset):
+    """Return the stripped line starting at byte `offset` in `path`."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.readline().decode("utf-8", errors="ignore").strip()
+
+
+class AnomalyRecord:
+    __slots__ = ("timestamp", "file", "line", "resp", "mse",
+                 "anomaly_type", "suggested_fix", "reason", "severity")
+
+    def __init__(self, timestamp, file, line, resp, mse, anomaly_type, suggested_fix, reason,
+                 severity="LOW"):
+        self.timestamp = timestamp
+        self.file = sys.intern(file)
+        self.line = line
+        self.resp = resp
+        self.mse = mse
+        # types / fixes come from a small fixed set, share one copy
+        self.anomaly_type = sys.intern(anomaly_type)
+        self.suggested_fix = sys.intern(suggested_fix)
+        self.reason = reason
+        self.severity = sys.intern(severity)
+
+    def as_row(self):
+        return [self.timestamp, self.file, self.line, self.resp, self.mse,
+                self.anomaly_type, self.suggested_fix, self.reason, self.severity]
+
+    @classmethod
+    def from_row(cls, row):
+        # rows written before the severity column default to LOW
+        return cls(row[0], row[1], int(row[2]), float(row[3]), float(row[4]),
+                   row[5], row[6], row[7], row[8] if len(row) > 8 else "LOW")
+
+    def __repr__(self):
+        return (f"AnomalyRecord({self.timestamp!r}, {self.file!r}, {self.line}, "
+                f"{self.anomaly_type!r}, mse={self.mse:.4f})")
+
+
+class AnomalyBuffer:
+    """
+    Column/array-backed anomaly store for bulk paths.
+
+    Numbers live in typed arrays, repeated strings (file, type, fix, severity) are
+    stored once and referenced by index. Once more than `spill_threshold`
+    rows are held in memory they are appended to a CSV spill file and the
+    arrays are cleared, so memory stays bounded however long monitoring runs.
+    """
+
+    def __init__(self, spill_threshold=SPILL_THRESHOLD, spill_path=None):
+        self.spill_threshold = spill_threshold
+        self.spill_path = spill_path
+        self._own_spill = spill_path is None
+        self.spilled = 0
+        self._lock = threading.Lock()
+        self._strings = []
+        self._string_ids = {}
+        self._reset_columns()
+
+    def _reset_columns(self):
+        self._timestamp = []
+        self._file = array("I")
+        self._line = array("q")
+        self._resp = array("d")
+        self._mse = array("d")
+        self._type = array("I")
+        self._fix = array("I")
+        self._severity = array("I")
+        self._reason = []
+
+    def _intern(self, s):
+        idx = self._string_ids.get(s)
+        if idx is None:
+            idx = len(self._strings)
+            self._strings.append(s)
+            self._string_ids[s] = idx
+        return idx
+
+    def __len__(self):
+        return self.spilled + len(self._timestamp)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def append(self, record):
+        with self._lock:
+            self._timestamp.append(record.timestamp)
+            self._file.append(self._intern(record.file))
+            self._line.append(record.line)
+            self._resp.append(record.resp)
+            self._mse.append(record.mse)
+            self._type.append(self._intern(record.anomaly_type))
+            self._fix.append(self._intern(record.suggested_fix))
+            self._severity.append(self._intern(record.severity))
+            self._reason.append(record.reason)
+            if len(self._timestamp) >= self.spill_threshold:
+                self._spill()
+
+    def _record_at(self, i):
+        s = self._strings
+        return AnomalyRecord(
+            self._timestamp[i], s[self._file[i]], self._line[i], self._resp[i],
+            self._mse[i], s[self._type[i]], s[self._fix[i]], self._reason[i],
+            s[self._severity[i]]
+        )
+
+    def _spill(self):
+        if not self._timestamp:
+            return
+        if self.spill_path is None:
+            fd, self.spill_path = tempfile.mkstemp(prefix="anomalies_", suffix=".csv")
+            os.close(fd)
+            _owned_spills.add(self.spill_path)
+        with open(self.spill_path, "a", newline="") as f:
+            w = csv.writer(f)
+            for i in range(len(self._timestamp)):
+                w.writerow(self._record_at(i).as_row())
+        self.spilled += len(self._timestamp)
+        self._reset_columns()
+
+    def snapshot(self):
+        """
+        Flush everything to the spill file and return the row count.
+        Rows [0, count) can then be read with iter_spilled() while
+        monitoring keeps appending.
+        """
+        with self._lock:
+            self._spill()
+            return self.spilled
+
+    def iter_spilled(self, limit=None):
+        if self.spill_path is None:
+            return
+        with open(self.spill_path, newline="") as f:
+            for n, row in enumerate(csv.reader(f)):
+                if limit is not None and n >= limit:
+                    break
+                yield AnomalyRecord.from_row(row)
+
+    def __iter__(self):
+        # spilled rows first, then whatever is still in memory
+        with self._lock:
+            spilled = self.spilled
+            in_memory = [self._record_at(i) for i in range(len(self._timestamp))]
+        yield from self.iter_spilled(spilled)
+        yield from in_memory
+
+    def clear(self):
+        with self._lock:
+            self._reset_columns()
+            self._strings = []
+            self._string_ids = {}
+            if self.spill_path and os.path.exists(self.spill_path):
+                if self._own_spill:
+                    self._remove_spill()
+                else:
+                    open(self.spill_path, "w").close()
+            self.spilled = 0
+
+    def _remove_spill(self):
+        try:
+            os.remove(self.spill_path)
+        except OSError:
+            pass
+        _owned_spills.discard(self.spill_path)
+        self.spill_path = None
+
+    def close(self):
+        """Drop all rows and delete the temp spill file if this buffer created it."""
+        self.clear()
+        with self._lock:
+            if self._own_spill and self.spill_path:
+                self._remove_spill()
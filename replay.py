@@ -0,0 +1,293 @@
+# replay.py
+# Accelerated replay / synthetic load generator for the live pipeline.
+#
+#   python replay.py nemo.log ec2_cpu_utilization_24ae8d.csv --out watched/ \
+#       --speed 600 --parallel 4 --inject-every 500 --alerts realtime_report.csv
+#
+# .log sources are re-emitted line by line, NAB CSVs (timestamp,value) are
+# converted to the "timestamp file=...:N resp=..." format parser.LOG_RE reads.
+import argparse
+import csv
+import os
+import socket
+import statistics
+import threading
+import time
+from datetime import datetime
+
+from parser import LOG_RE
+
+INJECT_RESP = 5000.0
+INJECT_MSG = "msg='INJECTED timeout'"
+
+
+# --------------------
+# Sources
+# --------------------
+def _parse_ts(text):
+    try:
+        return datetime.fromisoformat(text.strip())
+    except ValueError:
+        return None
+
+
+def load_source(path):
+    """Return a list of (datetime | None, resp, tail) for a .log or NAB .csv file."""
+    rows = []
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    resp = float(row["value"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                rows.append((_parse_ts(row.get("timestamp", "")), resp, "msg='REPLAY'"))
+        return rows
+
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            match = LOG_RE.search(line)
+            if not match:
+                continue
+            # LOG_RE stops at whitespace, so "2014-02-14 14:27:00" only yields
+            # the time; look at the text before file= for the full stamp
+            ts = _parse_ts(line[:line.find("file=")]) or _parse_ts(match.group("timestamp"))
+            tail = line[match.end():].strip()
+            rows.append((ts, float(match.group("resp")), tail))
+    return rows
+
+
+def format_line(ts, name, line_no, resp, tail):
+    stamp = ts.strftime("%Y-%m-%dT%H:%M:%S") if ts else datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    return f"{stamp} file={name}:{line_no} resp={resp} {tail}\n"
+
+
+# --------------------
+# Sinks
+# --------------------
+class FolderSink:
+    """Appends lines to <folder>/<name>.log, one write+flush per batch."""
+
+    def __init__(self, folder, name):
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, f"{name}.log")
+        self._f = open(self.path, "a", encoding="utf-8")
+
+    def write(self, lines):
+        self._f.write("".join(lines))
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+class SocketSink:
+    """Sends lines over one TCP connection (tcp://host:port)."""
+
+    def __init__(self, address):
+        host, port = address.rsplit(":", 1)
+        self._sock = socket.create_connection((host, int(port)))
+
+    def write(self, lines):
+        self._sock.sendall("".join(lines).encode("utf-8"))
+
+    def close(self):
+        self._sock.close()
+
+
+def open_sink(target, name):
+    if target.startswith("tcp://"):
+        return SocketSink(target[len("tcp://"):])
+    return FolderSink(target, name)
+
+
+# --------------------
+# Replay
+# --------------------
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.per_second = {}
+        self.injected = {}          # (file, line) -> wall time written
+        self.latencies = {}         # (file, line) -> seconds until alert
+
+    def record(self, n, injected=()):
+        now = time.time()
+        with self.lock:
+            self.sent += n
+            sec = int(now)
+            self.per_second[sec] = self.per_second.get(sec, 0) + n
+            for key in injected:
+                self.injected[key] = now
+
+
+def replay_source(rows, name, target, stats, stop, speed=None, rate=None,
+                  inject_every=0, batch_size=100, batch_interval=0.05):
+    sink = open_sink(target, name)
+    min_gap = 1.0 / rate if rate else 0.0
+    batch, batch_injected = [], []
+    last_flush = time.perf_counter()
+    prev_ts = None
+    due = time.perf_counter()
+    line_no = 0
+
+    def flush():
+        nonlocal batch, batch_injected, last_flush
+        if batch:
+            sink.write(batch)
+            stats.record(len(batch), batch_injected)
+        batch, batch_injected = [], []
+        last_flush = time.perf_counter()
+
+    try:
+        for ts, resp, tail in rows:
+            if stop.is_set():
+                break
+
+            # pacing: source timestamps / speed, capped by --rate. Lines are
+            # scheduled on a virtual clock so short gaps accumulate instead of
+            # each paying for a (coarse) sleep.
+            gap = min_gap
+            if speed and ts is not None and prev_ts is not None:
+                gap = max(gap, (ts - prev_ts).total_seconds() / speed)
+            prev_ts = ts
+            due += gap
+            delay = due - time.perf_counter()
+            if delay > 0.002:
+                flush()
+                time.sleep(delay)
+
+            line_no += 1
+            batch.append(format_line(ts, name, line_no, resp, tail))
+
+            if inject_every and line_no % inject_every == 0:
+                line_no += 1
+                batch.append(format_line(ts, name, line_no, INJECT_RESP, INJECT_MSG))
+                batch_injected.append((name, line_no))
+                flush()     # injections go out immediately so latency is exact
+
+            if len(batch) >= batch_size or time.perf_counter() - last_flush >= batch_interval:
+                flush()
+        flush()
+    finally:
+        sink.close()
+
+
+def tail_alerts(path, stats, stop):
+    """Follow the alert CSV (gui_monitor's realtime report) and time injected rows."""
+    existed = os.path.exists(path)
+    while not os.path.exists(path) and not stop.is_set():
+        time.sleep(0.05)
+    if stop.is_set():
+        return
+    with open(path, "r", newline="", encoding="utf-8", errors="ignore") as f:
+        if existed:
+            f.seek(0, os.SEEK_END)      # only alerts raised during this run
+        pending = ""
+        while not stop.is_set():
+            chunk = f.read()
+            if not chunk:
+                time.sleep(0.05)
+                continue
+            now = time.time()
+            pending += chunk
+            *complete, pending = pending.split("\n")
+            for row in csv.reader(complete):
+                if len(row) < 3 or not row[2].isdigit():
+                    continue
+                key = (os.path.basename(row[1]), int(row[2]))
+                with stats.lock:
+                    if key in stats.injected and key not in stats.latencies:
+                        stats.latencies[key] = now - stats.injected[key]
+
+
+def source_name(path, replica, parallel):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}_{replica}" if parallel > 1 else stem
+
+
+def report(stats, elapsed, alerts=False):
+    print("\n===== replay summary =====")
+    print(f"lines sent:        {stats.sent}")
+    print(f"elapsed:           {elapsed:.2f} s")
+    print(f"throughput:        {stats.sent / elapsed:,.0f} lines/s" if elapsed else "throughput: n/a")
+    full_seconds = sorted(stats.per_second.items())[1:-1]   # drop partial first/last second
+    if full_seconds:
+        counts = [n for _, n in full_seconds]
+        print(f"sustained (1s):    min {min(counts):,} / median {int(statistics.median(counts)):,} lines/s")
+
+    if stats.injected:
+        print(f"injected:          {len(stats.injected)}")
+    if stats.injected and alerts:
+        # detection is only known when an alert file was followed
+        lat = sorted(stats.latencies.values())
+        print(f"detected:          {len(lat)} ({100 * len(lat) / len(stats.injected):.1f}%)")
+        if lat:
+            p95 = lat[min(len(lat) - 1, int(0.95 * len(lat)))]
+            print(f"latency p50/p95/max: {statistics.median(lat):.3f} / {p95:.3f} / {lat[-1]:.3f} s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Replay logs / NAB CSVs into a watched folder or socket")
+    ap.add_argument("sources", nargs="+", help=".log files or NAB .csv files")
+    ap.add_argument("--out", required=True, help="watched folder, or tcp://host:port")
+    ap.add_argument("--speed", type=float, default=None,
+                    help="real-time multiplier using source timestamps (e.g. 600)")
+    ap.add_argument("--rate", type=float, default=None, help="max lines/s per source")
+    ap.add_argument("--parallel", type=int, default=1, help="replicas of every source")
+    ap.add_argument("--loops", type=int, default=1, help="replay each source N times")
+    ap.add_argument("--inject-every", type=int, default=0,
+                    help="inject an anomaly line every N lines (0 = off)")
+    ap.add_argument("--alerts", default=None,
+                    help="alert CSV to follow for detection latency (e.g. realtime_report.csv)")
+    ap.add_argument("--alert-wait", type=float, default=5.0,
+                    help="seconds to wait for outstanding alerts after replay")
+    args = ap.parse_args()
+
+    stats = Stats()
+    stop = threading.Event()
+    alert_stop = threading.Event()
+
+    alert_thread = None
+    if args.alerts:
+        alert_thread = threading.Thread(target=tail_alerts, args=(args.alerts, stats, alert_stop), daemon=True)
+        alert_thread.start()
+
+    threads = []
+    for path in args.sources:
+        rows = load_source(path) * args.loops
+        for replica in range(args.parallel):
+            name = source_name(path, replica, args.parallel)
+            t = threading.Thread(
+                target=replay_source,
+                args=(rows, name, args.out, stats, stop),
+                kwargs={"speed": args.speed, "rate": args.rate, "inject_every": args.inject_every},
+                daemon=True,
+            )
+            threads.append(t)
+
+    print(f"replaying {len(threads)} source(s) into {args.out}")
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    try:
+        for t in threads:
+            t.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for t in threads:
+            t.join()
+    elapsed = time.perf_counter() - start
+
+    if alert_thread:
+        deadline = time.time() + args.alert_wait
+        while time.time() < deadline and len(stats.latencies) < len(stats.injected):
+            time.sleep(0.1)
+        alert_stop.set()
+
+    report(stats, elapsed, alerts=bool(args.alerts))
+
+
+if __name__ == "__main__":
+    main()
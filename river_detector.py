@@ -14,18 +14,18 @@ def detect_river(line: str):
     if parsed is None:
         return None
 
-    x = parsed["features"]
+    x = parsed.features
 
     # River returns float score
     score = model.learn_one(x).score_one(x)
 
     if score > THRESHOLD:
         return {
-            "source_file": parsed["source_file"],
-            "line_number": parsed["line_number"],
+            "source_file": parsed.source_file,
+            "line_number": parsed.line_number,
             "anomaly_type": "river_high_score",
             "score": score,
-            "context": parsed["raw"]
+            "context": parsed.raw
         }
 
     return None
@@ -0,0 +1,151 @@
+# rules.py
+import json
+import os
+import re
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.json")
+SCAN_MIN_KEYWORDS = 24      # below this, per-keyword `in` checks beat one regex scan
+
+
+class Rule:
+    """
+    One classification rule from the rules file.
+
+    A rule matches when every keyword group has at least one hit in the
+    line, its regex (if any) matches and resp is above resp_gt (if set).
+    A rule with no conditions always matches and acts as the fallback.
+    """
+    __slots__ = ("name", "keyword_groups", "regex", "resp_gt",
+                 "anomaly_type", "severity", "fix", "reason")
+
+    def __init__(self, name, anomaly_type, fix, severity="LOW", keywords=None,
+                 regex=None, resp_gt=None, reason=None):
+        self.name = name
+        self.keyword_groups = [frozenset(k.lower() for k in group) for group in (keywords or [])]
+        self.regex = re.compile(regex, re.IGNORECASE) if regex else None
+        self.resp_gt = resp_gt
+        self.anomaly_type = anomaly_type
+        self.severity = severity
+        self.fix = fix
+        self.reason = reason
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d["name"], d["anomaly_type"], d["fix"],
+            severity=d.get("severity", "LOW"),
+            keywords=d.get("keywords"),
+            regex=d.get("regex"),
+            resp_gt=d.get("resp_gt"),
+            reason=d.get("reason"),
+        )
+
+    def is_fallback(self):
+        return not self.keyword_groups and self.regex is None and self.resp_gt is None
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, {self.anomaly_type!r}, {self.severity!r})"
+
+
+class RuleEngine:
+    """
+    Ordered rule table with every keyword compiled into one regex, so a
+    line is scanned once no matter how many rules there are.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        if not self.rules or not self.rules[-1].is_fallback():
+            self.rules.append(Rule("default", "ANOMALY", "Investigate (no clear reason)."))
+
+        # flattened (groups, resp_gt, regex, rule) rows; lines without any
+        # keyword hit only need the keyword-free rows
+        self._table = [(tuple(r.keyword_groups), r.resp_gt, r.regex, r) for r in self.rules]
+        self._plain_table = [row for row in self._table if not row[0]]
+
+        keywords = set()
+        for rule in self.rules:
+            for group in rule.keyword_groups:
+                keywords |= group
+
+        # substring semantics: a hit on "timeout" is also a hit on "time"
+        self._contains = {k: frozenset(o for o in keywords if o in k) for k in keywords}
+        self._keywords = tuple(sorted(keywords))
+        # keywords whose tail is the head of a longer keyword: a non-overlapping
+        # scan can hide that second hit ("connection reset" / "reset by peer")
+        self._overlapping = frozenset(
+            k for k in keywords
+            if any(o.startswith(k[j:]) and len(o) > len(k) - j
+                   for o in keywords for j in range(1, len(k)))
+        )
+
+        if keywords:
+            # longest keyword first; shorter keywords nested in a hit come from
+            # _contains. Matching a lowered line case-sensitively is ~10x
+            # faster than re.IGNORECASE.
+            alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+            self._scanner = re.compile(f"(?:{alternation})")
+            # zero-width lookahead: the longest keyword at every start offset,
+            # overlapping hits included. Only needed when _overlapping is hit.
+            self._overlap_scanner = re.compile(f"(?=({alternation}))")
+        else:
+            self._scanner = None
+
+    def keyword_hits(self, text):
+        if self._scanner is None or not text:
+            return frozenset()
+        text = text.lower()
+        if len(self._keywords) < SCAN_MIN_KEYWORDS:
+            # small tables: plain substring checks, exact by construction
+            return {k for k in self._keywords if k in text}
+        found = set(self._scanner.findall(text))
+        if not found:
+            return frozenset()
+        if not found.isdisjoint(self._overlapping):
+            found = set(self._overlap_scanner.findall(text))
+        hits = set()
+        for k in found:
+            hits |= self._contains[k]
+        return hits
+
+    def match(self, resp_value, raw_msg):
+        """Return the first matching Rule (the fallback rule if nothing else)."""
+        raw = raw_msg or ""
+        hits = self.keyword_hits(raw)
+        for groups, resp_gt, regex, rule in (self._table if hits else self._plain_table):
+            if groups and not all(hits & g for g in groups):
+                continue
+            if resp_gt is not None and not resp_value > resp_gt:
+                continue
+            if regex is not None and not regex.search(raw):
+                continue
+            return rule
+        return self.rules[-1]
+
+    def classify(self, resp_value, raw_msg):
+        """Return (anomaly_type, suggested_fix, reason_hint)."""
+        rule = self.match(resp_value, raw_msg)
+        return rule.anomaly_type, rule.fix, rule.reason
+
+
+def load_rules(path=RULES_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        table = json.load(f)
+    return RuleEngine([Rule.from_dict(d) for d in table["rules"]])
+
+
+_engine = None
+
+
+def get_engine():
+    """Shared engine loaded from RULES_PATH on first use."""
+    global _engine
+    if _engine is None:
+        _engine = load_rules()
+    return _engine
+
+
+def reload_rules(path=RULES_PATH):
+    global _engine
+    _engine = load_rules(path)
+    return _engine
@@ -0,0 +1,157 @@
+import gzip
+import os
+import threading
+import time
+
+import cluster as cluster_mod
+from cluster import Coordinator, HashRing, Sink, Worker
+
+
+def test_ring_is_deterministic_and_balanced():
+    sources = [f"service_{i}.log" for i in range(2000)]
+    a = HashRing(["w1", "w2", "w3", "w4"])
+    b = HashRing(["w4", "w3", "w2", "w1"])
+    assert all(a.node_for(s) == b.node_for(s) for s in sources)
+
+    counts = {}
+    for s in sources:
+        counts[a.node_for(s)] = counts.get(a.node_for(s), 0) + 1
+    assert set(counts) == {"w1", "w2", "w3", "w4"}
+    assert min(counts.values()) > 2000 / 4 * 0.5
+
+
+def test_ring_moves_only_the_joining_share():
+    sources = [f"service_{i}.log" for i in range(2000)]
+    ring = HashRing(["w1", "w2", "w3"])
+    before = {s: ring.node_for(s) for s in sources}
+    ring.add("w4")
+    moved = [s for s in sources if ring.node_for(s) != before[s]]
+    # only sources now owned by the new worker move
+    assert all(ring.node_for(s) == "w4" for s in moved)
+    assert len(moved) < 2000 * 0.4
+
+    ring.remove("w4")
+    assert all(ring.node_for(s) == before[s] for s in sources)
+
+
+def _serve(server):
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    return server.server_address
+
+
+def _write_source(folder, i, start, count, spike=None):
+    with open(folder / f"svc{i}.log", "a") as f:
+        for n in range(start, start + count):
+            resp = 900 if n == spike else 50 + n % 3
+            f.write(f"2025-11-23T12:00:00 file=svc{i}.py:{n} resp={resp} msg='OK'\n")
+
+
+def _wait_for_lines(sink, expected, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline and sink.totals()["lines"] < expected:
+        time.sleep(0.05)
+    time.sleep(0.2)     # catch duplicates arriving late
+    return sink.totals()
+
+
+class _Cluster:
+    def __init__(self, tmp_path):
+        self.folder = tmp_path / "logs"
+        self.folder.mkdir()
+        self.coordinator = Coordinator(("127.0.0.1", 0), verbose=False)
+        self.sink = Sink(("127.0.0.1", 0), str(tmp_path / "out.csv"))
+        self.coord_addr, self.sink_addr = _serve(self.coordinator), _serve(self.sink)
+        self.workers, self.threads = [], []
+
+    def start_worker(self, name):
+        w = Worker(name, str(self.folder), self.coord_addr, self.sink_addr, detector="zscore",
+                   poll_interval=0.05, handoff_delay=0.3, verbose=False)
+        t = threading.Thread(target=w.run, daemon=True)
+        t.start()
+        self.workers.append(w)
+        self.threads.append(t)
+        return w
+
+    def close(self):
+        for w in self.workers:
+            w.stop()
+        for t in self.threads:
+            t.join(timeout=5)
+        for server in (self.coordinator, self.sink):
+            server.shutdown()
+            server.server_close()
+
+
+def test_workers_split_sources_and_report_to_sink(tmp_path):
+    cluster = _Cluster(tmp_path)
+    for i in range(6):
+        _write_source(cluster.folder, i, 0, 80, spike=70)
+    try:
+        workers = [cluster.start_worker("w0"), cluster.start_worker("w1")]
+        totals = _wait_for_lines(cluster.sink, 6 * 80)
+        assert totals["lines"] == 6 * 80
+        assert totals["anomalies"] == 6
+        owned = [set(w.positions) for w in workers]
+        assert not owned[0] & owned[1]
+        assert owned[0] | owned[1] == {f"svc{i}.log" for i in range(6)}
+    finally:
+        cluster.close()
+
+
+def test_rebalance_resumes_from_reported_offsets(tmp_path):
+    cluster = _Cluster(tmp_path)
+    for i in range(8):
+        _write_source(cluster.folder, i, 0, 60)
+    try:
+        first = cluster.start_worker("w0")
+        assert _wait_for_lines(cluster.sink, 8 * 60)["lines"] == 8 * 60
+
+        second = cluster.start_worker("w1")
+        time.sleep(0.6)     # rebalance + handoff delay
+        assert second.positions, "new worker should take over some sources"
+        for i in range(8):
+            _write_source(cluster.folder, i, 60, 40)
+        # every line scored exactly once across the handoff
+        assert _wait_for_lines(cluster.sink, 8 * 100)["lines"] == 8 * 100
+
+        first.stop()
+        cluster.threads[0].join(timeout=5)
+        time.sleep(0.6)
+        assert len(second.positions) == 8
+        for i in range(8):
+            _write_source(cluster.folder, i, 100, 10)
+        assert _wait_for_lines(cluster.sink, 8 * 110)["lines"] == 8 * 110
+    finally:
+        cluster.close()
+
+
+def test_bad_source_does_not_stop_worker(tmp_path):
+    cluster = _Cluster(tmp_path)
+    for i in range(3):
+        _write_source(cluster.folder, i, 0, 60)
+    # archive cut off mid-write: reading it raises EOFError
+    data = gzip.compress(b"".join(b"2025-11-23T12:00:00 file=old.py:%d resp=50 msg='OK'\n" % n
+                                  for n in range(500)))
+    (cluster.folder / "old.log.1.gz").write_bytes(data[:len(data) // 2])
+    try:
+        worker = cluster.start_worker("w0")
+        assert _wait_for_lines(cluster.sink, 3 * 60)["lines"] >= 3 * 60
+        for i in range(3):
+            _write_source(cluster.folder, i, 60, 20)
+        assert _wait_for_lines(cluster.sink, 3 * 80)["lines"] >= 3 * 80
+        assert cluster.threads[0].is_alive()
+        assert not worker.stop_event.is_set()
+    finally:
+        cluster.close()
+
+
+def test_large_backlog_is_read_in_slices(tmp_path, monkeypatch):
+    monkeypatch.setattr(cluster_mod, "MAX_READ_BYTES", 100)    # ~1.5 lines per poll
+    cluster = _Cluster(tmp_path)
+    _write_source(cluster.folder, 0, 0, 40)
+    try:
+        cluster.start_worker("w0")
+        assert _wait_for_lines(cluster.sink, 40)["lines"] == 40
+    finally:
+        cluster.close()
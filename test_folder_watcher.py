@@ -0,0 +1,139 @@
+import gzip
+import os
+
+import folder_watcher
+from folder_watcher import FolderWatcher
+
+
+def _lines(results):
+    return {os.path.basename(p): [l.strip() for l in lines] for p, lines in results}
+
+
+def test_only_new_complete_lines_in_order(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("a\nb\n")
+    w = FolderWatcher(str(tmp_path), full_scan_interval=0)
+    try:
+        assert _lines(w.poll()) == {"app.log": ["a", "b"]}
+        assert w.poll() == []
+
+        with open(log, "a") as f:
+            f.write("c\nd")          # "d" is still being written
+        assert _lines(w.poll()) == {"app.log": ["c"]}
+        with open(log, "a") as f:
+            f.write("\ne\n")
+        assert _lines(w.poll()) == {"app.log": ["d", "e"]}
+    finally:
+        w.close()
+
+
+def test_oversized_line_does_not_stall(tmp_path, monkeypatch):
+    monkeypatch.setattr(folder_watcher, "MAX_READ_BYTES", 16)
+    log = tmp_path / "app.log"
+    log.write_text("x" * 40 + "\nok\n")
+    w = FolderWatcher(str(tmp_path), full_scan_interval=0)
+    try:
+        got = []
+        for _ in range(10):
+            for _, lines in w.poll():
+                got.extend(lines)
+        assert "".join(got) == "x" * 40 + "\nok\n"
+        assert got[-1] == "ok\n"
+    finally:
+        w.close()
+
+
+def test_broken_archive_does_not_lose_other_files(tmp_path):
+    log = tmp_path / "a.log"
+    log.write_text("a1\n")
+    w = FolderWatcher(str(tmp_path), full_scan_interval=0)
+    try:
+        assert _lines(w.poll()) == {"a.log": ["a1"]}
+        data = gzip.compress(b"".join(b"z%d\n" % i for i in range(2000)))
+        (tmp_path / "b.log.gz").write_bytes(data[:len(data) // 2])     # cut off mid-write
+        with open(log, "a") as f:
+            f.write("a2\n")
+        assert _lines(w.poll()) == {"a.log": ["a2"]}
+
+        (tmp_path / "b.log.gz").write_bytes(data)                       # now complete
+        got = _lines(w.poll())
+        assert got["b.log.gz"] == [f"z{i}" for i in range(2000)]
+    finally:
+        w.close()
+
+
+def test_archives_are_read_in_bounded_slices(tmp_path, monkeypatch):
+    monkeypatch.setattr(folder_watcher, "MAX_READ_BYTES", 100)
+    for name in ("a.log.1.gz", "b.log.1.gz"):
+        with gzip.open(tmp_path / name, "wt") as f:
+            f.write("".join(f"{name} line {i}\n" for i in range(50)))
+    # one open stream at most: the other archive resumes by skipping lines
+    w = FolderWatcher(str(tmp_path), max_readers=1, full_scan_interval=3600)
+    try:
+        got = {"a.log.1.gz": [], "b.log.1.gz": []}
+        for _ in range(100):
+            for path, lines in w.poll():
+                assert sum(map(len, lines)) < 100 + 25     # budget + one line
+                got[os.path.basename(path)].extend(l.strip() for l in lines)
+        for name, lines in got.items():
+            assert lines == [f"{name} line {i}" for i in range(50)]
+        assert all(s.stream is None for s in w._files.values())
+    finally:
+        w.close()
+
+
+def test_truncation_restarts_file(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("one\ntwo\n")
+    w = FolderWatcher(str(tmp_path), full_scan_interval=0)
+    try:
+        w.poll()
+        log.write_text("x\n")
+        assert _lines(w.poll()) == {"app.log": ["x"]}
+    finally:
+        w.close()
+
+
+def test_include_exclude_and_recursive(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.log").write_text("a\n")
+    (tmp_path / "skip.log").write_text("s\n")
+    (tmp_path / "notes.md").write_text("n\n")
+    (tmp_path / "sub" / "b.txt").write_text("b\n")
+    with gzip.open(tmp_path / "sub" / "old.log.1.gz", "wt") as f:
+        f.write("z1\nz2\n")
+
+    flat = FolderWatcher(str(tmp_path), exclude=("skip.log",))
+    deep = FolderWatcher(str(tmp_path), exclude=("skip.log",), recursive=True)
+    try:
+        assert _lines(flat.poll()) == {"a.log": ["a"]}
+        assert _lines(deep.poll()) == {"a.log": ["a"], "b.txt": ["b"], "old.log.1.gz": ["z1", "z2"]}
+        assert deep.poll() == []
+    finally:
+        flat.close()
+        deep.close()
+
+
+def test_new_file_seen_without_full_scan(tmp_path):
+    (tmp_path / "a.log").write_text("a\n")
+    w = FolderWatcher(str(tmp_path), full_scan_interval=3600)
+    try:
+        w.poll()
+        (tmp_path / "b.log").write_text("b\n")
+        # directory mtime changed -> immediate re-scan
+        assert _lines(w.poll()) == {"b.log": ["b"]}
+    finally:
+        w.close()
+
+
+def test_start_at_end_skips_existing_content(tmp_path):
+    log = tmp_path / "app.log"
+    log.write_text("old\n")
+    w = FolderWatcher(str(tmp_path), start_at_end=True, full_scan_interval=0)
+    try:
+        assert w.poll() == []
+        with open(log, "a") as f:
+            f.write("new\n")
+        assert _lines(w.poll()) == {"app.log": ["new"]}
+    finally:
+        w.close()
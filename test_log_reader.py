@@ -0,0 +1,65 @@
+import bz2
+import gzip
+import threading
+import time
+
+from log_reader import iter_lines, iter_lines_with_offsets, is_compressed
+from records import read_raw_line
+
+
+LINES = [f"2025-11-23T12:00:{i % 60:02d} file=m.py:{i} resp={i * 0.5} msg='OK'\n" for i in range(500)]
+
+
+def test_plain_and_compressed_match(tmp_path):
+    data = "".join(LINES).encode()
+    plain = tmp_path / "app.log"
+    gz = tmp_path / "app.log.1.gz"
+    bz = tmp_path / "app.log.2.bz2"
+    plain.write_bytes(data)
+    gz.write_bytes(gzip.compress(data))
+    bz.write_bytes(bz2.compress(data))
+
+    assert list(iter_lines(str(plain))) == LINES
+    # tiny chunks force lines to straddle chunk boundaries
+    assert list(iter_lines(str(gz), chunk_size=7)) == LINES
+    assert list(iter_lines(str(bz), chunk_size=13, queue_depth=1)) == LINES
+
+
+def test_last_line_without_newline(tmp_path):
+    gz = tmp_path / "x.gz"
+    gz.write_bytes(gzip.compress(b"a\nb\nlast"))
+    assert list(iter_lines(str(gz), chunk_size=2)) == ["a\n", "b\n", "last"]
+
+
+def test_early_exit_stops_reader(tmp_path):
+    gz = tmp_path / "big.gz"
+    gz.write_bytes(gzip.compress("".join(LINES * 20).encode()))
+    before = set(threading.enumerate())
+    it = iter_lines(str(gz), chunk_size=64, queue_depth=1)
+    assert next(it) == LINES[0]
+    workers = set(threading.enumerate()) - before
+    assert workers
+    time.sleep(0.1)     # let the producer fill the queue and block on put()
+
+    it.close()
+    for t in workers:
+        t.join(timeout=2)
+        assert not t.is_alive()
+
+
+def test_offsets_resolve_back_to_lines(tmp_path):
+    plain = tmp_path / "app.log"
+    plain.write_bytes("".join(LINES[:20]).encode())
+    pairs = list(iter_lines_with_offsets(str(plain)))
+    assert [line for _, line in pairs] == LINES[:20]
+    assert read_raw_line(str(plain), pairs[7][0]) == LINES[7].strip()
+
+    gz = tmp_path / "app.log.1.gz"
+    gz.write_bytes(gzip.compress(b"a\nb\n"))
+    assert list(iter_lines_with_offsets(str(gz))) == [(None, "a\n"), (None, "b\n")]
+
+
+def test_is_compressed():
+    assert is_compressed("logs/app.log.3.GZ")
+    assert is_compressed("app.zst")
+    assert not is_compressed("app.log")
@@ -0,0 +1,74 @@
+import os
+
+from parser import parse_line
+from records import AnomalyRecord, AnomalyBuffer, read_raw_line
+
+
+LINE = "2025-11-23T12:00:01 file=module1.py:10 resp=52.3 msg='OK'\n"
+
+
+def test_parse_line_fields():
+    p = parse_line(LINE)
+    assert p.timestamp == "2025-11-23T12:00:01"
+    assert p.source_file == "module1.py"
+    assert p.line_number == 10
+    assert p.resp == 52.3
+    assert p.features == {"resp": 52.3}
+    assert p.raw == LINE.strip()
+
+
+def test_parse_line_no_match():
+    assert parse_line("garbage line") is None
+
+
+def test_source_file_is_interned():
+    a = parse_line(LINE)
+    b = parse_line(LINE.replace(":10", ":11"))
+    assert a.source_file is b.source_file
+
+
+def test_raw_by_offset(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("header\n" + LINE)
+    p = parse_line(LINE, offset=7, keep_raw=False)
+    assert p.raw is None
+    assert read_raw_line(str(path), p.offset) == LINE.strip()
+
+
+def test_anomaly_buffer_spills_and_keeps_order(tmp_path):
+    buf = AnomalyBuffer(spill_threshold=3, spill_path=str(tmp_path / "spill.csv"))
+    for i in range(7):
+        buf.append(AnomalyRecord(f"t{i}", "a.py", i, 1.0 * i, 0.1, "ERROR", "fix", "r"))
+
+    assert len(buf) == 7
+    assert buf.spilled == 6
+    assert [r.line for r in buf] == list(range(7))
+
+    assert buf.snapshot() == 7
+    assert [r.timestamp for r in buf.iter_spilled(2)] == ["t0", "t1"]
+
+    buf.clear()
+    assert len(buf) == 0
+    assert not buf
+
+
+def test_anomaly_buffer_close_removes_temp_spill():
+    buf = AnomalyBuffer(spill_threshold=2)
+    for i in range(3):
+        buf.append(AnomalyRecord(f"t{i}", "a.py", i, 1.0, 0.1, "ERROR", "fix", "r"))
+    path = buf.spill_path
+    assert os.path.exists(path)
+
+    buf.close()
+    assert not os.path.exists(path)
+    assert buf.spill_path is None
+    assert len(buf) == 0
+
+
+def test_anomaly_buffer_keeps_severity(tmp_path):
+    buf = AnomalyBuffer(spill_threshold=2, spill_path=str(tmp_path / "spill.csv"))
+    for sev in ("CRITICAL", "LOW", "HIGH"):
+        buf.append(AnomalyRecord("t", "a.py", 1, 1.0, 0.1, "SLOW API", "fix", "r", sev))
+    assert [r.severity for r in buf] == ["CRITICAL", "LOW", "HIGH"]
+    # rows from before the severity column
+    assert AnomalyRecord.from_row(["t", "a.py", "1", "1.0", "0.1", "E", "f", "r"]).severity == "LOW"
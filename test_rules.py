@@ -0,0 +1,62 @@
+import rules
+from rules import Rule, RuleEngine, get_engine
+
+
+def test_default_table_matches_old_ladder():
+    engine = get_engine()
+    assert engine.classify(10, "request TIMED OUT")[0] == "CRITICAL SPIKE"
+    assert engine.classify(10, "Login denied for bob")[0] == "AUTH FAILURE"
+    assert engine.classify(10, "NullPointerException")[0] == "ERROR"
+    assert engine.classify(10, "slow database query")[0] == "DB ISSUE"
+    assert engine.classify(600, "msg='OK'")[0] == "CRITICAL SPIKE"
+    assert engine.classify(150, "msg='OK'")[0] == "HIGH RESPONSE"
+    assert engine.classify(60, "msg='OK'")[0] == "MEDIUM SPIKE"
+    assert engine.classify(10, "msg='OK'") == ("ANOMALY", "Investigate (no clear reason).", None)
+
+
+def test_nested_keywords():
+    engine = RuleEngine([
+        Rule("a", "A", "fix a", keywords=[["time"], ["out"]]),
+        Rule("b", "B", "fix b", keywords=[["timeout"], ["fail"]]),
+    ])
+    # "time" and "out" are both nested inside the longer "timeout" hit
+    assert engine.classify(0, "TIMEOUT")[0] == "A"
+    assert engine.classify(0, "shout")[0] == "ANOMALY"
+
+
+def test_overlapping_keywords():
+    engine = RuleEngine([
+        Rule("peer", "PEER", "fix peer", keywords=[["reset by peer"]]),
+        Rule("conn", "CONN", "fix conn", keywords=[["connection reset"]]),
+    ])
+    # the hits overlap on "reset" without either containing the other
+    assert engine.classify(0, "connection reset by peer")[0] == "PEER"
+
+    engine = RuleEngine([Rule("both", "BOTH", "fix", keywords=[["login"], ["incorrect"]])])
+    assert engine.classify(0, "logincorrect")[0] == "BOTH"
+
+
+def test_regex_scan_matches_substring_checks(monkeypatch):
+    # large tables use the compiled scan instead of per-keyword checks
+    monkeypatch.setattr(rules, "SCAN_MIN_KEYWORDS", 0)
+    engine = RuleEngine([
+        Rule("peer", "PEER", "fix peer", keywords=[["reset by peer"]]),
+        Rule("conn", "CONN", "fix conn", keywords=[["connection reset"]]),
+        Rule("both", "BOTH", "fix", keywords=[["login"], ["incorrect"]]),
+        Rule("a", "A", "fix a", keywords=[["time"], ["out"]]),
+    ])
+    assert engine.classify(0, "connection reset by peer")[0] == "PEER"
+    assert engine.classify(0, "logincorrect")[0] == "BOTH"
+    assert engine.classify(0, "TIMEOUT")[0] == "A"
+    assert engine.classify(0, "shout")[0] == "ANOMALY"
+
+
+def test_regex_and_threshold_combined():
+    engine = RuleEngine([
+        Rule("slow_api", "SLOW API", "check api", severity="CRITICAL",
+             regex=r"/api/v\d+", resp_gt=100),
+    ])
+    assert engine.classify(200, "GET /api/v2/users")[0] == "SLOW API"
+    assert engine.match(200, "GET /api/v2/users").severity == "CRITICAL"
+    assert engine.classify(50, "GET /api/v2/users")[0] == "ANOMALY"
+    assert engine.classify(200, "GET /static")[0] == "ANOMALY"
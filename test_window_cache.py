@@ -0,0 +1,41 @@
+from window_cache import WindowCache
+
+import numpy as np
+
+
+def test_flat_windows_share_key():
+    cache = WindowCache(maxsize=8, tolerance=1e-3)
+    a = np.full(50, 0.134)
+    b = np.full(50, 0.1341)      # within tolerance
+    c = np.full(50, 0.2)
+    assert cache.key(a) == cache.key(b)
+    assert cache.key(a) != cache.key(c)
+
+
+def test_lru_eviction_and_stats():
+    cache = WindowCache(maxsize=2, tolerance=1e-3)
+    k1, k2, k3 = (cache.key(np.full(50, v)) for v in (1.0, 2.0, 3.0))
+
+    assert cache.get(k1) is None
+    cache.put(k1, "r1")
+    cache.put(k2, "r2")
+    assert cache.get(k1) == "r1"      # k1 now most recent
+    cache.put(k3, "r3")               # evicts k2
+
+    assert cache.get(k2) is None
+    assert cache.get(k3) == "r3"
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+    assert stats["hit_rate"] == 0.5
+
+
+def test_zero_size_disables_cache():
+    cache = WindowCache(maxsize=0)
+    k = cache.key(np.zeros(50))
+    cache.put(k, "r")
+    assert cache.get(k) is None
+    assert len(cache) == 0
@@ -0,0 +1,76 @@
+# window_cache.py
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+CACHE_SIZE = 4096          # max cached windows
+CACHE_TOLERANCE = 1e-3     # quantization step (in scaled units)
+
+
+class WindowCache:
+    """
+    Bounded LRU cache for autoencoder reconstructions.
+
+    Windows are keyed by a hash of the quantized, scaled values, so
+    flat or repeated stretches (e.g. 0.134 over and over) hit the cache
+    instead of calling model.predict again.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE, tolerance=CACHE_TOLERANCE):
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0")
+        if tolerance <= 0:
+            raise ValueError("tolerance must be > 0")
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, scaled):
+        q = np.round(np.asarray(scaled, dtype=np.float64) / self.tolerance).astype(np.int64)
+        return hashlib.blake2b(q.tobytes(), digest_size=16).digest()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "tolerance": self.tolerance,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }